@@ -3,22 +3,31 @@ import os
 import sys
 import time
 import json
+import functools
+import hashlib
+import http.client
+import heapq
+import io
 import threading
 import queue
+import random
 import subprocess
-from collections import deque
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 import curses
-import textwrap
 import re
-from typing import Optional, List, Tuple, Dict
+from typing import Callable, Optional, List, Tuple, Dict
 from pathlib import Path
 import wave
 import argparse
+import atexit
+import bisect
 import tomllib
 from html import unescape
-from urllib.parse import urlparse
-from urllib.request import Request, urlopen
+from html.parser import HTMLParser
+from urllib.parse import ParseResult, urlparse, urlsplit
 import urllib.error
 import termios
 import tty
@@ -42,10 +51,11 @@ def _restore_terminal_state():
             pass
 
 
+_RE_SLUG_SEP = re.compile(r'[^a-zA-Z0-9]+')
+_RE_SLUG_DASHES = re.compile(r'-{2,}')
 def _slugify(value: str) -> str:
-    import re
-    slug = re.sub(r'[^a-zA-Z0-9]+', '-', value.strip().lower())
-    slug = re.sub(r'-{2,}', '-', slug).strip('-')
+    slug = _RE_SLUG_SEP.sub('-', value.strip().lower())
+    slug = _RE_SLUG_DASHES.sub('-', slug).strip('-')
     return slug or 'session'
 # Debug/verbose logging toggle
 DEBUG = False
@@ -58,6 +68,49 @@ try:
         pass
 except Exception:
     vosk = None
+# Vosk results are tiny JSON objects; pull the single string field out directly
+_RE_VOSK_TEXT = re.compile(r'"text"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_RE_VOSK_PARTIAL = re.compile(r'"partial"\s*:\s*"((?:[^"\\]|\\.)*)"')
+def _vosk_field(rx: re.Pattern, result: str) -> str:
+    m = rx.search(result)
+    if not m:
+        return ''
+    raw = m.group(1)
+    # Only escaped strings need the JSON decoder
+    return json.loads('"' + raw + '"') if '\\' in raw else raw
+# Optional fast HTML parser (lexbor-backed); stdlib HTMLParser is used otherwise
+try:
+    from selectolax.parser import HTMLParser as _LexborHTMLParser  # type: ignore
+except Exception:
+    _LexborHTMLParser = None
+# Optional pooled HTTP client for context URLs (installed alongside requests)
+_CONTEXT_HTTP_HEADERS = {"User-Agent": "live-assistant-context/0.1", "Accept-Encoding": "gzip, deflate"}
+try:
+    import urllib3  # type: ignore
+    _HTTP = urllib3.PoolManager(maxsize=8, headers=_CONTEXT_HTTP_HEADERS)
+except Exception:
+    urllib3 = None
+    _HTTP = None
+# Optional pooled session for the LLM helpers so keep-alive/TLS is reused across calls
+try:
+    import requests  # type: ignore
+    from requests.adapters import HTTPAdapter  # type: ignore
+    _SESSION = requests.Session()
+    _SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+    _SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+except Exception:
+    requests = None
+    _SESSION = None
+# Optional faster JSON codec for LLM request bodies and responses; stdlib json otherwise
+try:
+    import orjson  # type: ignore
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except Exception:
+    orjson = None
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    _json_loads = json.loads
 # ----------------------
 # Profiled config support
 # ----------------------
@@ -350,13 +403,18 @@ def list_pulse_devices(kind: str) -> List[Tuple[str, str]]:
 # Context loading helpers
 # ----------------------
 ACCEPTED_CONTEXT_EXTS = {'.txt', '.md', '.markdown', '.pdf'}
+_ACCEPTED_CONTEXT_EXT_NAMES = frozenset(e[1:] for e in ACCEPTED_CONTEXT_EXTS)
 _WARNED_NO_PDFTOTEXT = False
 _CONTEXT_FALLBACK_BULLET = "- No information available; meeting dialogue lacked references to provided external context sources or citations currently recorded."
+@functools.lru_cache(maxsize=256)
+def _parsed(url: str) -> ParseResult:
+    """Memoized urlparse; the same entry is parsed by canonical_context_id, the context planner and labels."""
+    return urlparse(url)
 def canonical_context_id(raw: str) -> Optional[str]:
     candidate = (raw or '').strip()
     if not candidate:
         return None
-    parsed = urlparse(candidate)
+    parsed = _parsed(candidate)
     if parsed.scheme in {'http', 'https'}:
         return candidate
     try:
@@ -364,8 +422,8 @@ def canonical_context_id(raw: str) -> Optional[str]:
         return str(p)
     except Exception:
         return candidate
-def _label_for_url(url: str) -> str:
-    parsed = urlparse(url)
+def _label_for_url(url: str, parsed: Optional[ParseResult] = None) -> str:
+    parsed = parsed or _parsed(url)
     host = parsed.netloc or url
     path = parsed.path.rstrip('/')
     label = host + (path if path else '')
@@ -373,32 +431,166 @@ def _label_for_url(url: str) -> str:
     if len(label) > 80:
         return label[:77] + '...'
     return label
+_HTML_SKIP_TAGS = frozenset({'script', 'style', 'head'})
+_RE_BLANK_RUN = re.compile(r'\n{3,}')
+_RE_HSPACE_RUN = re.compile(r'[ \t]{2,}')
+_HTML_BLOCK_TAGS = frozenset({'br', 'p', 'div', 'li', 'tr', 'table', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'section', 'article'})
+class _Plainifier(HTMLParser):
+    """Collects visible text in one pass; drops script/style/head, breaks lines on block tags."""
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.buf: List[str] = []
+        self.skip_depth = 0
+        self.open_skips: Dict[str, int] = {}  # per-tag depth, so one unclosed tag can be dropped on its own
+    def handle_starttag(self, tag, attrs):
+        if tag == 'body' and self.open_skips.get('head'):
+            # An unclosed <head> ends where the body starts
+            self.skip_depth -= self.open_skips.pop('head')
+        if tag in _HTML_SKIP_TAGS:
+            self.open_skips[tag] = self.open_skips.get(tag, 0) + 1
+            self.skip_depth += 1
+        elif not self.skip_depth:
+            self.buf.append('\n' if tag in _HTML_BLOCK_TAGS else ' ')
+    def handle_startendtag(self, tag, attrs):
+        if not self.skip_depth and tag not in _HTML_SKIP_TAGS:
+            self.buf.append('\n' if tag in _HTML_BLOCK_TAGS else ' ')
+    def handle_endtag(self, tag):
+        if tag in _HTML_SKIP_TAGS:
+            if self.open_skips.get(tag):
+                self.open_skips[tag] -= 1
+                self.skip_depth -= 1
+        elif not self.skip_depth:
+            self.buf.append('\n' if tag in _HTML_BLOCK_TAGS else ' ')
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.buf.append(data)
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+_RE_BLOCK_TAG = re.compile(r'(?i)</?(?:br|p|div|li|tr|table|h[1-6]|section|article)\b[^<>]*>')
+_RE_ANY_TAG = re.compile(r'<[^<>]*>')
+def _find_tag(low: str, tok: str, start: int, delims: str = '> \t\r\n\f/') -> int:
+    """Index of `tok` in `low` at or after `start` when a tag-name boundary follows it (not </header> for </head>), else -1."""
+    n = len(low)
+    while True:
+        i = low.find(tok, start)
+        after = i + len(tok)
+        if i < 0 or after >= n or low[after] in delims:
+            return i
+        start = after
+def _strip_tagpair(html: str, tag: str, ends_at: Optional[str] = None) -> str:
+    """Drop <tag ...>...</tag> blocks (case-insensitive) using str.find scans, so cost stays linear.
+
+    `ends_at` names a tag that also ends the block when the close tag is missing (<body> for <head>).
+    """
+    low = html.translate(_ASCII_LOWER)  # length-preserving, unlike str.lower()
+    open_tok, close_tok = '<' + tag, '</' + tag
+    out: List[str] = []
+    pos = 0
+    search = 0
+    n = len(html)
+    end_at = 0
+    while True:
+        i = low.find(open_tok, search)
+        if i < 0:
+            break
+        after = i + len(open_tok)
+        if after < n and low[after] not in '> \t\r\n\f/':
+            search = after  # e.g. <header> when stripping <head>
+            continue
+        out.append(html[pos:i])
+        out.append(' ')
+        j = _find_tag(low, close_tok, after, '> \t\r\n\f')
+        if ends_at is not None:
+            if 0 <= end_at < after:
+                end_at = _find_tag(low, '<' + ends_at, after)  # rescan only once passed, so cost stays linear
+            if end_at >= 0 and (j < 0 or end_at < j):
+                pos = search = end_at  # keep the start tag; the any-tag pass removes it later
+                continue
+        k = low.find('>', j) if j >= 0 else -1
+        if k < 0:
+            pos = n  # unclosed block: drop the remainder
+            break
+        pos = search = k + 1
+    out.append(html[pos:])
+    return ''.join(out)
+def _html_to_text_fallback(html: str) -> str:
+    for tag in _HTML_SKIP_TAGS:
+        html = _strip_tagpair(html, tag, 'body' if tag == 'head' else None)
+    return unescape(_RE_ANY_TAG.sub(' ', _RE_BLOCK_TAG.sub('\n', html)))
 def _html_to_text(html: str) -> str:
     """Best-effort HTML → plain text conversion without extra deps."""
-    cleaned = re.sub(r'(?is)<(script|style).*?>.*?</\1>', ' ', html)
-    cleaned = re.sub(r'(?is)<head.*?>.*?</head>', ' ', cleaned)
-    cleaned = re.sub(r'(?is)</?(br|p|div|li|tr|table|h[1-6]|section|article)[^>]*>', '\n', cleaned)
-    cleaned = re.sub(r'<[^>]+>', ' ', cleaned)
-    text = unescape(cleaned)
-    text = re.sub(r'\r', '\n', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    text = re.sub(r'[ \t]{2,}', ' ', text)
+    text = None
+    if _LexborHTMLParser is not None:
+        try:
+            tree = _LexborHTMLParser(html)
+            tree.strip_tags(list(_HTML_SKIP_TAGS))
+            text = tree.text(separator='\n')
+        except Exception:
+            text = None
+    if text is None:
+        p = _Plainifier()
+        try:
+            p.feed(html)
+            p.close()
+            text = ''.join(p.buf)
+        except Exception:
+            text = _html_to_text_fallback(html)
+    text = text.replace('\r', '\n')
+    text = _RE_BLANK_RUN.sub('\n\n', text)
+    text = _RE_HSPACE_RUN.sub(' ', text)
     return text.strip()
-def _read_url(url: str, limit: int = 200_000, timeout: float = 12.0) -> str:
-    try:
-        req = Request(url, headers={"User-Agent": "live-assistant-context/0.1"})
+def _charset_from_content_type(content_type: str) -> Optional[str]:
+    for part in content_type.split(';')[1:]:
+        key, _, value = part.strip().partition('=')
+        if key == 'charset' and value:
+            return value.strip('"\' ')
+    return None
+@functools.lru_cache(maxsize=32)
+def _fetch_url_text(url: str, limit: int, timeout: float) -> str:
+    """Fetch url and return plain text; raises on network/HTTP errors so failures are not cached."""
+    buf = bytearray()
+    if _HTTP is None:
+        from urllib.request import Request, urlopen
+        req = Request(url, headers={"User-Agent": _CONTEXT_HTTP_HEADERS["User-Agent"]})
         with urlopen(req, timeout=timeout) as resp:
             content_type = (resp.headers.get('Content-Type') or '').lower()
             charset = resp.headers.get_content_charset() or 'utf-8'
-            raw = resp.read(limit + 4096)
-            if len(raw) > limit:
-                raw = raw[:limit]
-            text = raw.decode(charset, errors='ignore')
-            if 'html' in content_type or ('text' in content_type and '<' in text and '>' in text):
-                text = _html_to_text(text)
-            elif 'text' not in content_type and content_type:
-                return f"[Unsupported content type for {url}: {content_type}]"
-            return text[:limit]
+            while len(buf) < limit:
+                chunk = resp.read(65536)
+                if not chunk:
+                    break
+                buf += chunk
+    else:
+        r = _HTTP.request('GET', url, timeout=timeout, preload_content=False)
+        exhausted = False
+        try:
+            # Stop pulling bytes as soon as `limit` is covered instead of waiting for the whole page
+            for chunk in r.stream(65536):
+                buf += chunk
+                if len(buf) >= limit:
+                    break
+            else:
+                exhausted = True
+            if r.status >= 400:
+                raise urllib.error.HTTPError(url, r.status, r.reason or '', r.headers, io.BytesIO(bytes(buf)))
+        finally:
+            if not exhausted:
+                r.close()
+            r.release_conn()
+        content_type = (r.headers.get('Content-Type') or '').lower()
+        charset = _charset_from_content_type(content_type) or 'utf-8'
+    raw = bytes(buf)
+    if len(raw) > limit:
+        raw = raw[:limit]
+    text = raw.decode(charset, errors='ignore')
+    # Trust the Content-Type; ambiguous text/* only gets a 1 KB peek for markup
+    if 'html' in content_type or (content_type.startswith('text') and b'<' in raw[:1024]):
+        text = _html_to_text(text)
+    elif 'text' not in content_type and content_type:
+        return f"[Unsupported content type for {url}: {content_type}]"
+    return text[:limit]
+def _read_url(url: str, limit: int = 200_000, timeout: float = 12.0) -> str:
+    try:
+        return _fetch_url_text(url, limit, timeout)
     except urllib.error.HTTPError as e:
         body = ''
         try:
@@ -409,23 +601,83 @@ def _read_url(url: str, limit: int = 200_000, timeout: float = 12.0) -> str:
         return f"[HTTP error for {url}: {msg}]"
     except Exception as e:
         return f"[Could not fetch {url}: {e}]"
+def _context_cache_dir() -> Path:
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg).expanduser() if xdg else Path.home() / ".cache"
+    return base / "live_assistant" / "context"
+_CONTEXT_CACHE_MAX_FILES = 64
+def _context_cache_path(p: Path, limit: int) -> Path:
+    """Cache file for an extracted context file, keyed by size/mtime/path/limit (no content hashing)."""
+    st = p.stat()
+    fp = hashlib.blake2b(f"{st.st_size}:{st.st_mtime_ns}:{limit}:{p}".encode(), digest_size=16).hexdigest()
+    return _context_cache_dir() / (fp + '.txt')
+def _cached_context_text(p: Path, limit: int) -> Optional[str]:
+    try:
+        path = _context_cache_path(p, limit)
+        with open(path, 'r', encoding='utf-8') as fh:
+            text = fh.read(limit)
+        os.utime(path)  # mark as recently used for _prune_context_cache()
+        return text
+    except Exception:
+        return None
+def _prune_context_cache(cache_dir: Path) -> None:
+    """Keep only the most recently used cache files."""
+    try:
+        entries = sorted(cache_dir.glob('*.txt'), key=lambda f: f.stat().st_mtime, reverse=True)
+        for stale in entries[_CONTEXT_CACHE_MAX_FILES:]:
+            stale.unlink(missing_ok=True)
+    except Exception:
+        pass
+def _store_context_text(p: Path, text: str, limit: int) -> None:
+    try:
+        dest = _context_cache_path(p, limit)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f"{dest.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(text, encoding='utf-8')
+        os.replace(tmp, dest)
+    except Exception:
+        return
+    _prune_context_cache(dest.parent)
 def _read_text_file(p: Path, limit: int = 200_000) -> str:
+    cached = _cached_context_text(p, limit)
+    if cached is not None:
+        return cached
     try:
-        txt = p.read_text(encoding='utf-8', errors='ignore')
-        return txt[:limit]
+        txt = p.read_text(encoding='utf-8', errors='ignore')[:limit]
     except Exception as e:
         return f"[Could not read text file {p.name}: {e}]"
+    _store_context_text(p, txt, limit)
+    return txt
 def _read_pdf_file(p: Path, limit: int = 200_000) -> str:
+    cached = _cached_context_text(p, limit)
+    if cached is not None:
+        return cached
     # Prefer external 'pdftotext' if available (no extra Python deps)
     try:
         import shutil
         if shutil.which('pdftotext'):
-            # Use layout to preserve lines reasonably; output to stdout
-            proc = subprocess.run(['pdftotext', '-layout', '-q', str(p), '-'], capture_output=True, text=True)
-            if proc.returncode == 0 and proc.stdout:
-                return proc.stdout[:limit]
+            # Use layout to preserve lines reasonably; stream stdout and stop once `limit` is reached
+            proc = subprocess.Popen(['pdftotext', '-layout', '-q', str(p), '-'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            try:
+                data = proc.stdout.read(limit)
+            finally:
+                proc.stdout.close()
+            truncated = len(data) >= limit
+            if truncated:
+                proc.terminate()
+            try:
+                rc = proc.wait(timeout=1 if truncated else 30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                rc = proc.wait()
+            err = proc.stderr.read(400).decode('utf-8', errors='ignore')
+            proc.stderr.close()
+            if data and (truncated or rc == 0):
+                txt = data.decode('utf-8', errors='ignore')
+                _store_context_text(p, txt, limit)
+                return txt
             else:
-                return f"[pdftotext failed for {p.name}: rc={proc.returncode}]\n{(proc.stderr or '')[:400]}"
+                return f"[pdftotext failed for {p.name}: rc={rc}]\n{err}"
     except Exception:
         pass
     # Fallback minimal message
@@ -438,24 +690,40 @@ def _read_pdf_file(p: Path, limit: int = 200_000) -> str:
             pass
         _WARNED_NO_PDFTOTEXT = True
     return f"[PDF not extracted; install 'pdftotext' (poppler-utils) or convert {p.name} to .txt/.md]"
-def collect_context(paths: List[str], max_total: int = 40_000) -> tuple[str, List[str]]:
-    """Load text context from files/dirs. Returns (combined_text, labels)."""
+def _iter_context_files(root: Path) -> List[Path]:
+    """Sorted accepted context files under root; other entries are rejected by name without a stat()."""
+    found: List[Path] = []
+    stack = [str(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    base, dot, ext = entry.name.rpartition('.')
+                    if dot and base and ext.lower() in _ACCEPTED_CONTEXT_EXT_NAMES and entry.is_file():
+                        found.append(Path(entry.path))
+                except OSError:
+                    continue
+    return sorted(found)
+def _plan_context_tasks(paths: List[str]) -> List[Tuple[str, Callable[[], str]]]:
+    """Resolve paths/URLs into ordered, de-duplicated (label, loader) tasks."""
     seen: set[str] = set()
-    texts: List[str] = []
-    labels: List[str] = []
+    tasks: List[Tuple[str, Callable[[], str]]] = []
     for raw in paths:
         if not raw:
             continue
-        parsed = urlparse(raw)
+        parsed = _parsed(raw)
         if parsed.scheme in {'http', 'https'}:
             if raw in seen:
                 continue
             seen.add(raw)
-            txt = _read_url(raw)
-            if txt:
-                label = _label_for_url(raw)
-                labels.append(label)
-                texts.append(f"\n\n# {label}\n\n" + txt)
+            tasks.append((_label_for_url(raw, parsed), functools.partial(_read_url, raw)))
             continue
         try:
             p = Path(raw).expanduser().resolve()
@@ -464,27 +732,43 @@ def collect_context(paths: List[str], max_total: int = 40_000) -> tuple[str, Lis
         if not p.exists():
             continue
         if p.is_dir():
-            for f in sorted(p.rglob('*')):
-                if f.is_file() and f.suffix.lower() in ACCEPTED_CONTEXT_EXTS:
-                    ap = str(f)
-                    if ap in seen:
-                        continue
-                    seen.add(ap)
-                    txt = _read_pdf_file(f) if f.suffix.lower() == '.pdf' else _read_text_file(f)
-                    if txt:
-                        labels.append(f.name)
-                        texts.append(f"\n\n# {f.name}\n\n" + txt)
+            files = _iter_context_files(p)
+        elif p.suffix.lower() in ACCEPTED_CONTEXT_EXTS:
+            files = [p]
         else:
-            if p.suffix.lower() not in ACCEPTED_CONTEXT_EXTS:
-                continue
-            ap = str(p)
+            continue
+        for f in files:
+            ap = str(f)
             if ap in seen:
                 continue
             seen.add(ap)
-            txt = _read_pdf_file(p) if p.suffix.lower() == '.pdf' else _read_text_file(p)
-            if txt:
-                labels.append(p.name)
-                texts.append(f"\n\n# {p.name}\n\n" + txt)
+            reader = _read_pdf_file if f.suffix.lower() == '.pdf' else _read_text_file
+            tasks.append((f.name, functools.partial(reader, f)))
+    return tasks
+def collect_context(paths: List[str], max_total: int = 40_000) -> tuple[str, List[str]]:
+    """Load text context from files/dirs. Returns (combined_text, labels)."""
+    tasks = _plan_context_tasks(paths)
+    texts: List[str] = []
+    labels: List[str] = []
+    if tasks:
+        # URL fetches and pdftotext runs are I/O-bound; overlap them and gather in input order.
+        total = 0
+        with ThreadPoolExecutor(max_workers=min(8, len(tasks))) as pool:
+            futures = [pool.submit(loader) for _, loader in tasks]
+            for i, ((label, _), fut) in enumerate(zip(tasks, futures)):
+                try:
+                    txt = fut.result()
+                except Exception:
+                    txt = ''
+                if txt:
+                    block = f"\n\n# {label}\n\n" + txt
+                    labels.append(label)
+                    texts.append(block)
+                    total += len(block)
+                if total >= max_total:
+                    for pending in futures[i + 1:]:
+                        pending.cancel()
+                    break
     combined = "".join(texts)
     if len(combined) > max_total:
         combined = combined[:max_total]
@@ -550,33 +834,44 @@ def choose_vosk_model_path() -> Optional[str]:
         return sel
     print(f"[!] Not a directory: {sel}. Proceeding without live ASR.")
     return None
-def discover_prompt_files() -> list[tuple[str, str]]:
-    """Return (display_name, absolute_path) for .md prompts.
-    - Scans typical locations and recursively searches for directories containing 'prompt' (case-insensitive).
-    - Honors PROMPT_DIR env if set.
-    """
-    here = Path(__file__).resolve().parent
-    roots = [here, Path.cwd()]
-    env_dir = os.environ.get('PROMPT_DIR')
-    if env_dir:
-        roots.append(Path(env_dir))
+_PROMPT_SCAN_SKIP_DIRS = frozenset({'node_modules', '__pycache__', 'venv', 'dist', 'build'})
+def _find_prompt_dirs(root: Path, max_depth: int = 3) -> List[Path]:
+    """Directories under root (depth <= max_depth) whose name contains 'prompt'; hidden/junk trees are pruned."""
+    found: List[Path] = []
+    stack = [(str(root), 1)]
+    while stack:
+        path, depth = stack.pop()
+        try:
+            it = os.scandir(path)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                name = entry.name
+                if name.startswith('.') or name in _PROMPT_SCAN_SKIP_DIRS:
+                    continue
+                try:
+                    if not entry.is_dir():
+                        continue
+                    if 'prompt' in name.lower():
+                        found.append(Path(entry.path))
+                    if depth < max_depth and not entry.is_symlink():
+                        stack.append((entry.path, depth + 1))
+                except OSError:
+                    continue
+    return found
+@functools.lru_cache(maxsize=4)
+def _discover_prompt_files_cached(roots: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
     candidates: set[Path] = set()
     # Direct candidates
-    for r in roots:
+    for r in map(Path, roots):
         for name in ('prompt_library', 'prompt library', 'prompts', 'Prompt Library'):
             d = (r / name)
             if d.is_dir():
                 candidates.add(d)
-    # Recursive: any directory with 'prompt' in its name (depth <= 2)
-    for r in roots:
-        for d in r.rglob('*'):
-            if d.is_dir() and 'prompt' in d.name.lower():
-                # limit depth to avoid scanning huge trees
-                try:
-                    if len(d.relative_to(r).parts) <= 3:
-                        candidates.add(d)
-                except Exception:
-                    pass
+    # Recursive: any directory with 'prompt' in its name (depth <= 3)
+    for r in map(Path, roots):
+        candidates.update(_find_prompt_dirs(r))
     seen=set()
     found: list[tuple[str,str]]=[]
     for d in sorted(candidates):
@@ -589,7 +884,19 @@ def discover_prompt_files() -> list[tuple[str, str]]:
                 found.append((f.name, ap))
         except Exception:
             pass
-    return found
+    return tuple(found)
+def discover_prompt_files() -> list[tuple[str, str]]:
+    """Return (display_name, absolute_path) for .md prompts.
+    - Scans typical locations and recursively searches for directories containing 'prompt' (case-insensitive).
+    - Honors PROMPT_DIR env if set.
+    - Results are memoized per set of roots, so repeat callers skip the directory walk.
+    """
+    here = Path(__file__).resolve().parent
+    roots = [here, Path.cwd()]
+    env_dir = os.environ.get('PROMPT_DIR')
+    if env_dir:
+        roots.append(Path(env_dir))
+    return list(_discover_prompt_files_cached(tuple(str(r) for r in roots)))
 def choose_summary_prompt() -> str | None:
     # Env override takes precedence
     env_path = os.environ.get('SUMMARY_PROMPT')
@@ -678,6 +985,17 @@ DEFAULT_CHAT_PROMPT = (
     "Answer the facilitator's questions using the latest transcript excerpt.\n"
     "If unsure, say you don't know. Cite speakers when possible."
 )
+# Fixed system prompts for the analyzer and the executive summary, with their context-aware variants
+ANALYZE_PROMPT = (
+    "You are a live meeting assistant. Analyze the provided transcript snippet and extract:\n"
+    "- Action Items (owner if clear)\n- Questions\n- Decisions\n- Key Topics (keywords)\n"
+    "Keep it concise and bulleted. If nothing, say 'None.'"
+)
+_ANALYZE_PROMPT_WITH_CONTEXT = ANALYZE_PROMPT + "\nUse the provided CONTEXT when relevant to improve precision."
+DEFAULT_SUMMARY_PROMPT = "You are a summarizer. Produce a clear, well-structured report appropriate to the user's chosen template."
+_SUMMARY_CONTEXT_SUFFIX = "\nUse provided CONTEXT to ground references; if unsure, say so."
+# Transcript tail handed to a chat request; gpt_chat_response() keeps only the last 80 lines of it
+CHAT_CONTEXT_LINES = 200
 def load_chat_prompt() -> tuple[str, str]:
     """Return (prompt_markdown, label) for the chatbot system prompt."""
     env_path = os.environ.get('CHAT_PROMPT')
@@ -700,11 +1018,35 @@ def load_chat_prompt() -> tuple[str, str]:
             except Exception:
                 pass
     return DEFAULT_CHAT_PROMPT, 'builtin.chatbot'
+_RE_KEY_PUNCT = re.compile(r"[^a-zA-Z0-9\s]")
+@dataclass(slots=True)
+class ChatEntry:
+    """One chatbot exchange; answer stays None while the request is pending."""
+    id: int
+    question: str
+    answer: Optional[str]
+    ts: float
+    draft: str = ''  # streamed text received so far while pending
+    encoded: bytes = b''  # JSON user/assistant messages for this turn once answered
 class SharedState:
+    TAIL_LINES = 60
     def __init__(self):
-        self.lock = threading.Lock()
+        # Separate locks so the ASR reader never waits on LLM/chat work.
+        # When more than one is needed, acquire in the order tx -> analysis -> chat.
+        self._tx_lock = threading.Lock()  # transcript, partial, segment, paused
+        self._analysis_lock = threading.Lock()  # analysis, bullet lists, qas, context
+        self._chat_lock = threading.Lock()  # chat history
         # Keep a bounded in-memory transcript for UI/analysis; full text is streamed to disk by LiveTranscriber.
         self.transcript: deque[str] = deque(maxlen=4000)
+        self._tx_version = 0  # bumped on every finalized line so readers can skip unchanged copies
+        # Per-pane change counters so the UI only repaints what moved
+        self._partial_version = 0
+        self._analysis_version = 0  # analysis text and context bundle
+        self._chat_version = 0
+        # Analyzer window: last TAIL_LINES lines and their newline join, rebuilt only after new lines
+        self._tail_lines: deque[str] = deque(maxlen=self.TAIL_LINES)
+        self._tail_join = ''
+        self._tail_join_version = 0
         self.partial = ''
         self.analysis = ''
         self.actions = []
@@ -715,6 +1057,13 @@ class SharedState:
         self._seen_questions = set()
         self._seen_decisions = set()
         self._seen_topics = set()
+        # Verbatim bullets already processed; the key sets only grow, so a repeat can never be accepted
+        self._raw_seen_actions: set[str] = set()
+        self._raw_seen_questions: set[str] = set()
+        self._raw_seen_decisions: set[str] = set()
+        self._raw_seen_topics: set[str] = set()
+        # Pre-rendered '- item' bullets per analysis section, appended as items arrive
+        self._section_bufs: Dict[str, List[str]] = {'Action Items': [], 'Questions': [], 'Decisions': [], 'Key Topics': []}
         # Interview mode capture and results
         self.segment_active = False
         self.segment_lines: List[str] = []
@@ -725,87 +1074,120 @@ class SharedState:
         self.context_labels: List[str] = []
         self._context_label_set: set[str] = set()
         self._context_entries: set[str] = set()
+        self._context_tails: Dict[int, str] = {}  # bounded tails by size; cleared whenever the context changes
         # Chatbot exchanges (id, question, answer or None while pending)
-        self._chat_history: List[Dict[str, object]] = []
+        self._chat_history: List[ChatEntry] = []
         self._chat_seq = 0
         # Pause control (when True, ignore incoming transcript/partial updates)
         self.paused = False
     _STOPWORDS = set('a an and are as at be been being but by for from had has have how i if in into is it its of on or our over so than that the their them then there these they this to under up was we what when where which who will with you your'.split())
+    # ASCII punctuation -> space; non-ASCII input falls back to _RE_KEY_PUNCT
+    _NORMALIZE_TABLE = {c: ' ' for c in range(128) if not (chr(c).isalnum() or chr(c).isspace())}
     @staticmethod
     def _normalize_key(s: str) -> str:
-        import re as _re
-        s = _re.sub(r"[^a-zA-Z0-9\s]", " ", s.lower()).strip()
-        toks = [t for t in s.split() if t and t not in SharedState._STOPWORDS]
+        low = s.lower()
+        if low.isascii():
+            low = low.translate(SharedState._NORMALIZE_TABLE)
+        else:
+            low = _RE_KEY_PUNCT.sub(' ', low)
+        toks = [t for t in low.split() if t not in SharedState._STOPWORDS]
         return " ".join(toks[:10])
     def add_text(self, line: str):
-        with self.lock:
+        with self._tx_lock:
             if self.paused:
                 return
             self.transcript.append(line)
+            self._tail_lines.append(line)
+            self._tx_version += 1
             if self.segment_active:
                 self.segment_lines.append(line)
     def set_partial(self, text: str):
-        with self.lock:
+        with self._tx_lock:
             if self.paused:
                 return
+            if text != self.partial:
+                self._partial_version += 1
             self.partial = text
             if self.segment_active:
                 self.segment_partial = text
     def set_analysis(self, text: str):
-        with self.lock:
+        with self._analysis_lock:
             self.analysis = text
+            self._analysis_version += 1
     def snapshot(self):
-        with self.lock:
+        with self._tx_lock, self._analysis_lock:
             return list(self.transcript), self.analysis, self.partial
+    def snapshot_since(self, version: int) -> Tuple[Optional[List[str]], str, str, int]:
+        """Like snapshot(), but returns None for the transcript when no line was added since `version`."""
+        with self._tx_lock, self._analysis_lock:
+            if version == self._tx_version:
+                return None, self.analysis, self.partial, version
+            return list(self.transcript), self.analysis, self.partial, self._tx_version
+    def render_versions(self) -> Tuple[int, int, int, int]:
+        """(transcript, partial, analysis, chat) change counters for the UI's dirty checks."""
+        with self._tx_lock, self._analysis_lock, self._chat_lock:
+            return self._tx_version, self._partial_version, self._analysis_version, self._chat_version
     def snapshot_tail(self, max_lines: int = 200) -> Tuple[List[str], str, str]:
         """Cheap tail-only snapshot for analyzer to avoid copying the full buffer."""
-        with self.lock:
+        with self._tx_lock, self._analysis_lock:
             if max_lines >= len(self.transcript):
                 return list(self.transcript), self.analysis, self.partial
             tail = list(self.transcript)[-max_lines:]
             return tail, self.analysis, self.partial
+    def snapshot_tail_text(self) -> Tuple[str, str]:
+        """Last TAIL_LINES finalized lines joined by newlines, plus the partial; the join is reused until a line arrives."""
+        with self._tx_lock:
+            if self._tail_join_version != self._tx_version:
+                self._tail_join = "\n".join(self._tail_lines)
+                self._tail_join_version = self._tx_version
+            return self._tail_join, self.partial
     # Interview helpers
     def start_segment(self):
-        with self.lock:
+        with self._tx_lock:
             self.segment_active = True
             self.segment_lines = []
             self.segment_partial = ''
     def stop_segment(self) -> str:
-        with self.lock:
+        with self._tx_lock:
             self.segment_active = False
             text = "\n".join(self.segment_lines + ([self.segment_partial] if self.segment_partial else []))
             self.segment_lines = []
             self.segment_partial = ''
             return text.strip()
     def add_qa(self, question: str, answer: str):
-        with self.lock:
+        with self._analysis_lock:
             self.qas.append((question.strip(), answer.strip()))
             self.analysis = answer.strip()
+            self._analysis_version += 1
     def get_qas(self) -> List[Tuple[str, str]]:
-        with self.lock:
+        with self._analysis_lock:
             return list(self.qas)
     # Pause helpers
     def set_paused(self, value: bool) -> None:
-        with self.lock:
+        with self._tx_lock:
             self.paused = bool(value)
             if value:
                 # Clear transient partial when pausing so UI stops changing
                 self.partial = ''
+                self._partial_version += 1
                 self.segment_partial = ''
     def toggle_paused(self) -> bool:
-        with self.lock:
+        with self._tx_lock:
             self.paused = not self.paused
             if self.paused:
                 self.partial = ''
+                self._partial_version += 1
                 self.segment_partial = ''
             return self.paused
     def is_paused(self) -> bool:
-        with self.lock:
+        with self._tx_lock:
             return self.paused
     # Context helpers
     def set_context_bundle(self, text: str, labels: List[str], entries: List[str]):
-        with self.lock:
+        with self._analysis_lock:
             self.context_text = text.strip()
+            self._context_tails.clear()
+            self._analysis_version += 1
             self.context_labels = []
             self._context_label_set = set()
             for label in labels:
@@ -819,7 +1201,7 @@ class SharedState:
         if not entry:
             return False
         added = False
-        with self.lock:
+        with self._analysis_lock:
             if entry in self._context_entries:
                 return False
             chunk = (text or '').strip()
@@ -827,6 +1209,7 @@ class SharedState:
                 if self.context_text:
                     self.context_text += "\n\n"
                 self.context_text += chunk
+                self._context_tails.clear()
                 added = True
             for label in labels:
                 clean = (label or '').strip()
@@ -836,80 +1219,94 @@ class SharedState:
                     added = True
             if added:
                 self._context_entries.add(entry)
+                self._analysis_version += 1
             return added
     def has_context_entry(self, entry_id: str) -> bool:
-        with self.lock:
+        with self._analysis_lock:
             return entry_id in self._context_entries
     def get_context(self) -> Tuple[str, List[str]]:
-        with self.lock:
+        with self._analysis_lock:
             return self.context_text, list(self.context_labels)
+    def get_context_tail(self, max_chars: int) -> Tuple[str, List[str]]:
+        """Like get_context(), but only the last max_chars; the slice is reused until the context changes."""
+        with self._analysis_lock:
+            tail = self._context_tails.get(max_chars)
+            if tail is None:
+                tail = self.context_text[-max_chars:] if len(self.context_text) > max_chars else self.context_text
+                self._context_tails[max_chars] = tail
+            return tail, list(self.context_labels)
     # Chatbot helpers
     def add_chat_question(self, question: str) -> int:
         q = (question or "").strip()
         if not q:
             return -1
-        with self.lock:
+        with self._chat_lock:
             cid = self._chat_seq
             self._chat_seq += 1
-            self._chat_history.append({"id": cid, "question": q, "answer": None, "ts": time.time()})
+            self._chat_history.append(ChatEntry(cid, q, None, time.time()))
+            self._chat_version += 1
             return cid
     def set_chat_answer(self, chat_id: int, answer: Optional[str]):
-        with self.lock:
+        clean = answer.strip() if answer else ""
+        with self._chat_lock:
+            for entry in reversed(self._chat_history):
+                if entry.id == chat_id:
+                    entry.answer = clean
+                    # Encode the finished turn once so later requests splice it instead of re-serializing
+                    turn = [{"role": "user", "content": entry.question}] if entry.question else []
+                    if clean:
+                        turn.append({"role": "assistant", "content": clean})
+                    entry.encoded = b','.join(_json_dumps(m) for m in turn)
+                    self._chat_version += 1
+                    break
+            else:
+                return
+        if answer:
+            with self._analysis_lock:
+                self.analysis = answer.strip()
+                self._analysis_version += 1
+    def set_pending_chat_delta(self, chat_id: int, text: str):
+        with self._chat_lock:
             for entry in reversed(self._chat_history):
-                if entry.get("id") == chat_id:
-                    entry["answer"] = (answer.strip() if answer else "")
-                    if answer:
-                        self.analysis = answer.strip()
+                if entry.id == chat_id:
+                    if entry.answer is None:
+                        entry.draft = text
+                        self._chat_version += 1
                     break
     def get_chat_history(self) -> List[Tuple[str, Optional[str], bool]]:
-        """Returns (question, answer, pending) tuples."""
-        with self.lock:
-            out: List[Tuple[str, Optional[str], bool]] = []
-            for entry in self._chat_history:
-                question = str(entry.get("question", ""))
-                answer = entry.get("answer")
-                pending = answer is None
-                out.append((question, answer if not pending else None, pending))
-            return out
+        """Returns (question, answer, pending) tuples; pending entries carry the streamed draft, if any."""
+        with self._chat_lock:
+            return [(e.question, e.answer, False) if e.answer is not None else (e.question, e.draft or None, True) for e in self._chat_history]
+    def get_encoded_chat_history(self, limit: int = 6) -> List[bytes]:
+        """Pre-encoded JSON messages for the answered turns among the last `limit` exchanges."""
+        with self._chat_lock:
+            return [e.encoded for e in self._chat_history[-limit:] if e.encoded]
     def has_pending_chat(self) -> bool:
-        with self.lock:
-            return any(entry.get("answer") is None for entry in self._chat_history)
-    def _add_unique(self, lst, seen, items):
+        with self._chat_lock:
+            return any(e.answer is None for e in self._chat_history)
+    def _add_unique(self, lst, seen, raw_seen, items, buf):
         for it in items:
             s = it.strip()
-            if not s:
+            if not s or s in raw_seen:
                 continue
+            raw_seen.add(s)
             key = SharedState._normalize_key(s)
             if not key or key in seen:
                 continue
             seen.add(key)
             lst.append(s)
+            buf.append(f'- {s}\n')
     def add_analysis_chunks(self, actions, questions, decisions, topics):
-        with self.lock:
-            self._add_unique(self.actions, self._seen_actions, actions)
-            self._add_unique(self.questions, self._seen_questions, questions)
-            self._add_unique(self.decisions, self._seen_decisions, decisions)
-            self._add_unique(self.topics, self._seen_topics, topics)
-            parts = []
-            if self.actions:
-                parts.append('Action Items:')
-                parts.extend([f'- {a}' for a in self.actions])
-                parts.append('')
-            if self.questions:
-                parts.append('Questions:')
-                parts.extend([f'- {q}' for q in self.questions])
-                parts.append('')
-            if self.decisions:
-                parts.append('Decisions:')
-                parts.extend([f'- {d}' for d in self.decisions])
-                parts.append('')
-            if self.topics:
-                parts.append('Key Topics:')
-                parts.extend([f'- {t}' for t in self.topics])
-                parts.append('')
-            self.analysis = "\n".join(parts).strip()
+        with self._analysis_lock:
+            bufs = self._section_bufs
+            self._add_unique(self.actions, self._seen_actions, self._raw_seen_actions, actions, bufs['Action Items'])
+            self._add_unique(self.questions, self._seen_questions, self._raw_seen_questions, questions, bufs['Questions'])
+            self._add_unique(self.decisions, self._seen_decisions, self._raw_seen_decisions, decisions, bufs['Decisions'])
+            self._add_unique(self.topics, self._seen_topics, self._raw_seen_topics, topics, bufs['Key Topics'])
+            self.analysis = ''.join(f'{title}:\n' + ''.join(buf) + '\n' for title, buf in bufs.items() if buf).rstrip()
+            self._analysis_version += 1
     def get_lists(self):
-        with self.lock:
+        with self._analysis_lock:
             return (list(self.actions), list(self.questions), list(self.decisions), list(self.topics))
 class LiveTranscriber:
     def __init__(self, source: str, session_dir: str, model_path: Optional[str], *, mic: Optional[str] = None, session_label: Optional[str] = None, on_text=None, on_partial=None):
@@ -938,6 +1335,10 @@ class LiveTranscriber:
             try:
                 model = vosk.Model(self.model_path)
                 self.recognizer = vosk.KaldiRecognizer(model, 16000)
+                try:
+                    self.recognizer.SetWords(False)
+                except Exception:
+                    pass
                 self.has_vosk = True
                 self.engine_label = f"vosk:{os.path.basename(self.model_path)}"
             except Exception as e:
@@ -1007,19 +1408,35 @@ class LiveTranscriber:
                 if line:
                     _log(f"ffmpeg: {line}")
         def reader():
+            # Unbuffered reads return whatever ffmpeg has produced (up to ~1 s of audio);
+            # WAV data is coalesced and the header is patched once when the writer closes.
+            fd = self.proc.stdout.fileno()
+            wav_pending = bytearray()
+            carry = b''
             try:
                 dbg("Reader thread started")
                 while not self.stop_event.is_set():
-                    chunk = self.proc.stdout.read(4000)
+                    chunk = os.read(fd, 32768)
                     if not chunk:
                         break
+                    if carry:
+                        chunk = carry + chunk
+                        carry = b''
+                    if len(chunk) & 1:
+                        # Keep 16-bit samples aligned across reads
+                        carry = chunk[-1:]
+                        chunk = chunk[:-1]
+                        if not chunk:
+                            continue
                     if self.writer:
-                        self.writer.writeframes(chunk)
+                        wav_pending += chunk
+                        if len(wav_pending) >= 65536:
+                            self.writer.writeframesraw(wav_pending)
+                            wav_pending.clear()
                     if self.has_vosk and self.recognizer:
                         try:
                             if self.recognizer.AcceptWaveform(chunk):
-                                res = json.loads(self.recognizer.Result())
-                                txt = res.get("text", "").strip()
+                                txt = _vosk_field(_RE_VOSK_TEXT, self.recognizer.Result()).strip()
                                 if txt:
                                     self.transcript_lines.append(txt)
                                     if self._transcript_fh:
@@ -1041,8 +1458,7 @@ class LiveTranscriber:
                                         pass
                             else:
                                 try:
-                                    pres = json.loads(self.recognizer.PartialResult())
-                                    ptxt = pres.get("partial", "").strip()
+                                    ptxt = _vosk_field(_RE_VOSK_PARTIAL, self.recognizer.PartialResult()).strip()
                                 except Exception:
                                     ptxt = ""
                                 if self.on_partial is not None:
@@ -1058,6 +1474,8 @@ class LiveTranscriber:
             finally:
                 try:
                     if self.writer:
+                        if wav_pending:
+                            self.writer.writeframesraw(wav_pending)
                         self.writer.close()
                         dbg("Closed WAV writer")
                     if self._transcript_fh:
@@ -1105,112 +1523,114 @@ class LiveTranscriber:
             counter += 1
         notes_path = candidate
         duration = time.time() - self.start_time
-        with open(notes_path, "w", encoding="utf-8") as f:
-            f.write(f"# Session Notes - {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n")
-            f.write("## Metadata\n")
-            f.write(f"- Source: `{source_label}`\n")
-            if sink_label:
-                f.write(f"- Sink: `{sink_label}`\n")
-            f.write(f"- Engine: `{self.engine_label}`\n")
-            if self.session_label:
-                f.write(f"- Session: `{self.session_label}`\n")
-            if llm_model:
-                f.write(f"- LLM: `{llm_model}`\n")
-            if prompt_label:
-                f.write(f"- Prompt: `{prompt_label}`\n")
-            if context_files:
-                f.write("- Context Files:\n")
-                for nm in context_files:
-                    f.write(f"  - {nm}\n")
-            f.write(f"- Duration: `{time.strftime('%H:%M:%S', time.gmtime(duration))}`\n")
-            f.write(f"- Generated: `{datetime.now().isoformat(timespec='seconds')}`\n\n")
-            if executive_summary:
-                f.write("## Executive Summary\n")
-                f.write(executive_summary.strip() + "\n\n")
-            if analysis_text:
-                f.write("## Live Analysis (final snapshot)\n")
-                f.write(analysis_text)
-                f.write("\n\n")
-            if qas:
-                f.write("## Interview Q&A\n")
-                for i, (q, a) in enumerate(qas, start=1):
-                    f.write(f"\n**Q{i}.** {q}\n\n")
-                    f.write(f"{a}\n")
-                f.write("\n")
-            if chats:
-                f.write("## Live Chatbot Exchanges\n")
-                for i, (q, a) in enumerate(chats, start=1):
-                    f.write(f"\n**You {i}.** {q}\n\n")
-                    f.write(f"**Assistant.** {a}\n")
-                f.write("\n")
-            if post_session_chats:
-                f.write("## Post-Session Chat\n")
-                for i, (q, a) in enumerate(post_session_chats, start=1):
-                    f.write(f"\n**You {i}.** {q}\n\n")
-                    f.write(f"**Assistant.** {a}\n")
-                f.write("\n")
-            if lists:
-                actions, questions, decisions, topics = lists
-                f.write("## Action Items\n")
-                if actions:
-                    for a in actions:
-                        f.write(f"- {a}\n")
-                else:
-                    f.write("- None captured.\n")
-                f.write("\n## Questions\n")
-                if questions:
-                    for q in questions:
-                        f.write(f"- {q}\n")
-                else:
-                    f.write("- None captured.\n")
-                f.write("\n## Decisions\n")
-                if decisions:
-                    for d in decisions:
-                        f.write(f"- {d}\n")
-                else:
-                    f.write("- None captured.\n")
-                f.write("\n## Key Topics\n")
-                if topics:
-                    for t in topics:
-                        f.write(f"- {t}\n")
-                else:
-                    f.write("- None captured.\n")
-                f.write("\n")
-            else:
-                f.write("## Summary\n- Conversation captured.\n\n")
-                f.write("## Key Topics\n—\n\n")
-                f.write("## Action Items\n- None captured.\n\n")
-                f.write("## Questions\n- None captured.\n\n")
-                f.write("## Decisions\n- None captured.\n\n")
-            if self.markers:
-                f.write("## Markers\n")
-                for t, label in self.markers:
-                    f.write(f"- {t:0.1f}s: {label}\n")
-                f.write("\n")
-            if self.notes:
-                f.write("## Notes\n")
-                for t, text in self.notes:
-                    f.write(f"- {t:0.1f}s: {text}\n")
-                f.write("\n")
-            f.write("## Full Transcript\n\n")
-            transcript_iter: List[str] = []
-            if self.transcript_path and self.transcript_path.exists():
-                try:
-                    transcript_iter = self.transcript_path.read_text(encoding="utf-8", errors="ignore").splitlines()
-                except Exception:
-                    transcript_iter = []
-            if not transcript_iter:
-                transcript_iter = list(self.transcript_lines)
-            for line in transcript_iter:
-                f.write(line.rstrip("\n") + "\n")
+        buf: List[str] = []
+        w = buf.append
+        w(f"# Session Notes - {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n")
+        w("## Metadata\n")
+        w(f"- Source: `{source_label}`\n")
+        if sink_label:
+            w(f"- Sink: `{sink_label}`\n")
+        w(f"- Engine: `{self.engine_label}`\n")
+        if self.session_label:
+            w(f"- Session: `{self.session_label}`\n")
+        if llm_model:
+            w(f"- LLM: `{llm_model}`\n")
+        if prompt_label:
+            w(f"- Prompt: `{prompt_label}`\n")
+        if context_files:
+            w("- Context Files:\n")
+            w("  - " + "\n  - ".join(context_files) + "\n")
+        w(f"- Duration: `{time.strftime('%H:%M:%S', time.gmtime(duration))}`\n")
+        w(f"- Generated: `{datetime.now().isoformat(timespec='seconds')}`\n\n")
+        if executive_summary:
+            w("## Executive Summary\n")
+            w(executive_summary.strip() + "\n\n")
+        if analysis_text:
+            w("## Live Analysis (final snapshot)\n")
+            w(analysis_text)
+            w("\n\n")
+        if qas:
+            w("## Interview Q&A\n")
+            for i, (q, a) in enumerate(qas, start=1):
+                w(f"\n**Q{i}.** {q}\n\n")
+                w(f"{a}\n")
+            w("\n")
+        if chats:
+            w("## Live Chatbot Exchanges\n")
+            for i, (q, a) in enumerate(chats, start=1):
+                w(f"\n**You {i}.** {q}\n\n")
+                w(f"**Assistant.** {a}\n")
+            w("\n")
+        if post_session_chats:
+            w("## Post-Session Chat\n")
+            for i, (q, a) in enumerate(post_session_chats, start=1):
+                w(f"\n**You {i}.** {q}\n\n")
+                w(f"**Assistant.** {a}\n")
+            w("\n")
+        if lists:
+            actions, questions, decisions, topics = lists
+            for heading, items in (("## Action Items\n", actions), ("\n## Questions\n", questions), ("\n## Decisions\n", decisions), ("\n## Key Topics\n", topics)):
+                w(heading)
+                w(("- " + "\n- ".join(items) + "\n") if items else "- None captured.\n")
+            w("\n")
+        else:
+            w("## Summary\n- Conversation captured.\n\n")
+            w("## Key Topics\n—\n\n")
+            w("## Action Items\n- None captured.\n\n")
+            w("## Questions\n- None captured.\n\n")
+            w("## Decisions\n- None captured.\n\n")
+        if self.markers:
+            w("## Markers\n")
+            for t, label in self.markers:
+                w(f"- {t:0.1f}s: {label}\n")
+            w("\n")
+        if self.notes:
+            w("## Notes\n")
+            for t, text in self.notes:
+                w(f"- {t:0.1f}s: {text}\n")
+            w("\n")
+        w("## Full Transcript\n\n")
+        transcript_iter: List[str] = []
+        if self.transcript_path and self.transcript_path.exists():
+            try:
+                transcript_iter = self.transcript_path.read_text(encoding="utf-8", errors="ignore").splitlines()
+            except Exception:
+                transcript_iter = []
+        if not transcript_iter:
+            transcript_iter = list(self.transcript_lines)
+        w("".join(line.rstrip("\n") + "\n" for line in transcript_iter))
+        # One write for the whole document instead of a write() per line
+        notes_path.write_text("".join(buf), encoding="utf-8")
         return str(notes_path)
 LOG_PATH: Optional[str] = None
+# One line-buffered append handle for the session log: every entry hits the file as it is written; closed at exit
+_LOG_FH = None
+_LOG_FH_PATH: Optional[str] = None
+_LOG_LOCK = threading.Lock()
+def _close_log():
+    global _LOG_FH, _LOG_FH_PATH
+    with _LOG_LOCK:
+        if _LOG_FH is not None:
+            try:
+                _LOG_FH.close()
+            except Exception:
+                pass
+        _LOG_FH = None
+        _LOG_FH_PATH = None
+atexit.register(_close_log)
 def _log(msg: str):
+    global _LOG_FH, _LOG_FH_PATH
     try:
         if LOG_PATH:
-            from datetime import datetime as _dt
-            with open(LOG_PATH, 'a', encoding='utf-8') as f:
-                f.write(f"[{_dt.now().isoformat(timespec='seconds')}] {msg}\n")
+            line = f"[{datetime.now().isoformat(timespec='seconds')}] {msg}\n"
+            with _LOG_LOCK:
+                if _LOG_FH is None or _LOG_FH_PATH != LOG_PATH:
+                    if _LOG_FH is not None:
+                        _LOG_FH.close()
+                    # Line-buffered, so every entry reaches disk even if the process dies right after
+                    _LOG_FH = open(LOG_PATH, 'a', encoding='utf-8', buffering=1)
+                    _LOG_FH_PATH = LOG_PATH
+                _LOG_FH.write(line)
     except Exception:
         pass
 def dbg(msg: str):
@@ -1218,91 +1638,268 @@ def dbg(msg: str):
     if not DEBUG:
         return
     _log(f"DEBUG: {msg}")
-def gpt_analyze(text: str, api_key: Optional[str], base_url: Optional[str], model: Optional[str], timeout: float = 12.0, context: Optional[str] = None, context_labels: Optional[List[str]] = None) -> Optional[str]:
+def _collect_stream(lines, on_delta: Optional[Callable[[str], None]] = None) -> Optional[str]:
+    """Concatenate delta.content from an SSE chat-completions stream, reporting progress to on_delta."""
+    text = ''
+    for raw in lines:
+        line = raw.strip()
+        if not line.startswith(b'data:'):
+            continue
+        data = line[5:].strip()
+        if data == b'[DONE]':
+            # Keep reading to the end of the body so the pooled connection can be reused
+            continue
+        try:
+            piece = (_json_loads(data)['choices'][0].get('delta') or {}).get('content')
+        except Exception:
+            continue
+        if piece:
+            text += piece
+            if on_delta is not None:
+                try:
+                    on_delta(text)
+                except Exception:
+                    pass
+    return text or None
+# Statuses worth retrying: throttling, gateway and provider overload errors
+_RETRYABLE_STATUS = frozenset({408, 409, 425, 429, 500, 502, 503, 504, 524, 529})
+def _message_content(j: dict) -> Optional[str]:
+    return j.get('choices', [{}])[0].get('message', {}).get('content')
+# Idle keep-alive connections for the urllib fallback, keyed by (scheme, netloc). A connection is
+# checked out for the duration of one request, so concurrent callers never share a socket.
+_HTTPS: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+_HTTPS_LOCK = threading.Lock()
+@functools.lru_cache(maxsize=1)
+def _env_has_proxy() -> bool:
+    import urllib.request
+    return bool(urllib.request.getproxies())
+def _urllib_post(url: str, body: bytes, headers: Dict[str, str], timeout: float, on_delta: Optional[Callable[[str], None]]) -> Tuple[int, bytes, Optional[str]]:
+    """Fallback POST without requests; same contract as _post_once, reusing connections across calls."""
+    if _env_has_proxy():
+        # http.client knows nothing about proxies; let urllib handle that setup
+        import urllib.request
+        req = urllib.request.Request(url, data=body, headers=headers)
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                if 'text/event-stream' in (resp.headers.get('Content-Type') or ''):
+                    return 200, b'', _collect_stream(resp, on_delta)
+                return 200, b'', _message_content(_json_loads(resp.read()))
+        except urllib.error.HTTPError as e:
+            return e.code, e.read(), None
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.netloc)
+    path = (parts.path or '/') + ('?' + parts.query if parts.query else '')
+    with _HTTPS_LOCK:
+        idle = _HTTPS.get(key)
+        conn = idle.pop() if idle else None
+    reused = conn is not None
+    if conn is None:
+        cls = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        conn = cls(parts.netloc, timeout=timeout)
+    elif conn.sock is not None:
+        conn.sock.settimeout(timeout)
+    try:
+        try:
+            conn.request('POST', path, body=body, headers=headers)
+            resp = conn.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            if not reused:
+                raise
+            # The server dropped an idle keep-alive socket; retry once on a fresh one
+            conn.close()
+            conn.request('POST', path, body=body, headers=headers)
+            resp = conn.getresponse()
+        if resp.status != 200:
+            result = (resp.status, resp.read(), None)
+        elif 'text/event-stream' in (resp.getheader('Content-Type') or ''):
+            result = (200, b'', _collect_stream(resp, on_delta))
+            # Drain whatever the SSE loop left unread and close, so the socket is pooled only when idle
+            resp.read()
+            resp.close()
+        else:
+            result = (200, b'', _message_content(_json_loads(resp.read())))
+    except BaseException:
+        conn.close()
+        raise
+    # A response that is not fully read would make the next request on this socket raise ResponseNotReady
+    if resp.will_close or not resp.isclosed():
+        conn.close()
+    else:
+        with _HTTPS_LOCK:
+            _HTTPS.setdefault(key, []).append(conn)
+    return result
+# JSON for large, stable messages (system prompt, context, transcript blocks) so repeat calls
+# splice the cached bytes instead of re-escaping kilobytes of text each time
+_MSG_JSON_CACHE: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+_MSG_JSON_CACHE_MAX = 64
+_MSG_JSON_MIN_CHARS = 512
+_MSG_JSON_LOCK = threading.Lock()
+class _EncodedMessages(bytes):
+    """Comma-joined JSON messages spliced verbatim into a request body."""
+def _encode_message(msg) -> bytes:
+    if isinstance(msg, _EncodedMessages):
+        return msg
+    content = msg.get('content') or ''
+    if len(msg) != 2 or len(content) < _MSG_JSON_MIN_CHARS:
+        return _json_dumps(msg)
+    key = (msg['role'], content)
+    with _MSG_JSON_LOCK:
+        hit = _MSG_JSON_CACHE.get(key)
+        if hit is not None:
+            _MSG_JSON_CACHE.move_to_end(key)
+            return hit
+    hit = _json_dumps(msg)
+    with _MSG_JSON_LOCK:
+        _MSG_JSON_CACHE[key] = hit
+        while len(_MSG_JSON_CACHE) > _MSG_JSON_CACHE_MAX:
+            _MSG_JSON_CACHE.popitem(last=False)
+    return hit
+def _encode_payload(payload: Dict[str, object]) -> bytes:
+    """JSON body for a chat-completions payload, reusing encoded messages where possible."""
+    rest = _json_dumps({k: v for k, v in payload.items() if k != 'messages'})
+    msgs = b','.join(_encode_message(m) for m in payload.get('messages') or ())
+    return b'{"messages":[' + msgs + (b'],' + rest[1:] if len(rest) > 2 else b']}')
+def _post_once(url: str, headers: Dict[str, str], payload: Dict[str, object], timeout: float, on_delta: Optional[Callable[[str], None]]) -> Tuple[int, bytes, Optional[str]]:
+    """One chat-completions POST; returns (status, raw error body, content). Status 0 means the transport failed.
+
+    Error bodies stay undecoded: the retry checks match on bytes and only a short prefix is ever logged.
+    """
+    body = _encode_payload(payload)
+    try:
+        if _SESSION is None:
+            return _urllib_post(url, body, headers, timeout, on_delta)
+        with _SESSION.post(url, headers=headers, data=body, timeout=timeout, stream=bool(payload.get('stream'))) as r:
+            if r.status_code != 200:
+                return r.status_code, r.content, None
+            if 'text/event-stream' in r.headers.get('content-type', ''):
+                return 200, b'', _collect_stream(r.iter_lines(), on_delta)
+            return 200, b'', _message_content(_json_loads(r.content))
+    except (OSError, http.client.HTTPException) as e:
+        # requests' exceptions, URLError and socket errors are OSError subclasses; http.client adds its own
+        return 0, str(e).encode('utf-8', errors='replace'), None
+_MIN_ATTEMPT_TIMEOUT = 5.0
+def _stream_refused(body: bytes) -> bool:
+    """True for a 400 that rejects `stream` (e.g. models an unverified org may not stream)."""
+    if b'"param": "stream"' in body or b'"param":"stream"' in body:
+        return True
+    low = body.lower()
+    return b'stream' in low and (b'unsupported' in low or b'not supported' in low)
+def _retrying_post(url: str, headers: Dict[str, str], payload: Dict[str, object], timeout: float, *, on_delta: Optional[Callable[[str], None]] = None, max_attempts: int = 5, label: str = 'GPT', budget: Optional[float] = None) -> Optional[str]:
+    """POST with jittered backoff on transient failures; parameter rewrites for picky models do not count as attempts.
+
+    `timeout` applies per attempt. With `budget` (seconds, all attempts and sleeps together) each attempt is
+    clipped to the time left, and no retry is made once its backoff would leave under _MIN_ATTEMPT_TIMEOUT.
+    """
+    payload = dict(payload)
+    attempt = 0
+    deadline = time.monotonic() + budget if budget is not None else None
+    try:
+        while True:
+            attempt_timeout = timeout
+            if deadline is not None:
+                attempt_timeout = min(timeout, deadline - time.monotonic())
+                if attempt_timeout < _MIN_ATTEMPT_TIMEOUT:
+                    _log(f"{label} request abandoned: {budget:.0f}s budget used up")
+                    return None
+            status, body, content = _post_once(url, headers, payload, attempt_timeout, on_delta)
+            dbg(f"{label} req status={status}")
+            if status == 200:
+                if on_delta is not None and content and not payload.get('stream'):
+                    on_delta(content)  # the stream was refused; show the whole answer at once
+                return content
+            if status == 400 and 'stream' in payload and _stream_refused(body):
+                _log(f"{label} retrying without streaming")
+                payload.pop('stream', None)
+                continue
+            if status == 400 and b'max_tokens' in body and b'max_completion_tokens' in body and 'max_completion_tokens' not in payload:
+                _log(f"{label} retrying with max_completion_tokens")
+                payload['max_completion_tokens'] = payload.pop('max_tokens', None)
+                continue
+            if status == 400 and b'"param": "temperature"' in body and 'temperature' in payload:
+                _log(f"{label} retrying without temperature")
+                payload.pop('temperature', None)
+                continue
+            attempt += 1
+            if (status == 0 or status in _RETRYABLE_STATUS) and attempt < max_attempts:
+                wait = random.uniform(2, 4) * attempt
+                if deadline is not None and deadline - time.monotonic() - wait < _MIN_ATTEMPT_TIMEOUT:
+                    _log(f"{label} transient failure status={status}; no retry left within the {budget:.0f}s budget")
+                    return None
+                _log(f"{label} transient failure status={status}; retry {attempt}/{max_attempts - 1} in {wait:.1f}s")
+                time.sleep(wait)
+                continue
+            _log(f"{label} request failed: status={status} body={body[:300].decode('utf-8', errors='ignore')}")
+            return None
+    except Exception as e:
+        _log(f"{label} call exception: {e}")
+        return None
+# Completions keyed by a digest of everything that shapes the request; a quiet meeting
+# re-sends the same snippet every analyzer tick, so those are answered locally.
+_RESP_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_RESP_CACHE_MAX = 256
+_RESP_CACHE_LOCK = threading.Lock()
+def _resp_cache_key(*parts: Optional[str]) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update((part or '').encode('utf-8', 'surrogatepass'))
+        h.update(b'\x00')
+    return h.hexdigest()
+def _resp_cache_get(key: str) -> Optional[str]:
+    with _RESP_CACHE_LOCK:
+        hit = _RESP_CACHE.get(key)
+        if hit is not None:
+            _RESP_CACHE.move_to_end(key)
+        return hit
+def _resp_cache_put(key: str, content: Optional[str]) -> None:
+    if not content:
+        return
+    with _RESP_CACHE_LOCK:
+        _RESP_CACHE[key] = content
+        _RESP_CACHE.move_to_end(key)
+        while len(_RESP_CACHE) > _RESP_CACHE_MAX:
+            _RESP_CACHE.popitem(last=False)
+def gpt_analyze(text: str, api_key: Optional[str], base_url: Optional[str], model: Optional[str], timeout: float = 12.0, context: Optional[str] = None, context_labels: Optional[List[str]] = None, budget: Optional[float] = None) -> Optional[str]:
     if not api_key or not model:
         return None
-    try:
-        import requests  # type: ignore
-    except Exception:
-        requests = None  # type: ignore
+    labels_key = "\n".join(context_labels[:8]) if context_labels else None
+    # Slice the context and transcript once to the widest window; the smaller views below come from that copy
+    ctx = context[-8000:] if context else ''
+    snippet = text[-6000:]
+    cache_key = _resp_cache_key('analyze', base_url, model, snippet, ctx, labels_key)
+    cached = _resp_cache_get(cache_key)
+    if cached is not None:
+        dbg("GPT analyze cache hit")
+        return cached
     url = (base_url.rstrip('/') if base_url else "https://api.openai.com/v1") + "/chat/completions"
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-    prompt = (
-        "You are a live meeting assistant. Analyze the provided transcript snippet and extract:\n"
-        "- Action Items (owner if clear)\n- Questions\n- Decisions\n- Key Topics (keywords)\n"
-        "Keep it concise and bulleted. If nothing, say 'None.'"
-    )
-    
-    def _post(payload):
-        try:
-            if requests is not None:
-                r = requests.post(url, headers=headers, json=payload, timeout=timeout)
-                return r.status_code, r.text, (r.json() if 'application/json' in r.headers.get('content-type','') else None)
-            else:
-                import urllib.request, urllib.error
-                req = urllib.request.Request(url, data=json.dumps(payload).encode('utf-8'), headers=headers)
-                try:
-                    with urllib.request.urlopen(req, timeout=timeout) as resp:
-                        body = resp.read().decode('utf-8')
-                        try:
-                            j = json.loads(body)
-                        except Exception:
-                            j = None
-                        return 200, body, j
-                except urllib.error.HTTPError as e:
-                    body = e.read().decode('utf-8', errors='ignore')
-                    return e.code, body, None
-        except Exception as e:
-            _log(f'GPT call failed: {e}')
-            return 0, None, None
     base_messages = [
-        {"role": "system", "content": prompt + ("\nUse the provided CONTEXT when relevant to improve precision." if context else "")},
+        {"role": "system", "content": _ANALYZE_PROMPT_WITH_CONTEXT if context else ANALYZE_PROMPT},
     ]
     if context_labels:
         sources = "\n".join(f"- {lbl}" for lbl in context_labels[:8])
         base_messages.append({"role": "system", "content": "CONTEXT SOURCES:\n" + sources})
     if context:
-        base_messages.append({"role": "system", "content": ("CONTEXT (may be partial):\n" + context[-8000:])})
+        base_messages.append({"role": "system", "content": ("CONTEXT (may be partial):\n" + ctx)})
     # Also include context once in the user channel to boost grounding on some providers
     if context:
-        base_messages.append({"role": "user", "content": "Reference context (truncated):\n" + context[-6000:]})
-    base_messages.append({"role": "user", "content": text[-6000:]})
+        base_messages.append({"role": "user", "content": "Reference context (truncated):\n" + ctx[-6000:]})
+    base_messages.append({"role": "user", "content": snippet})
     payload: Dict[str, object] = {"model": model, "messages": base_messages, "temperature": 0.2, "max_tokens": 300}
-    def _maybe_retry(payload_dict: Dict[str, object], status_code: int, response_body: Optional[str], response_json: Optional[dict]) -> tuple[int, Optional[str], Optional[dict], Dict[str, object]]:
-        nonlocal payload
-        status_local, body_local, json_local = status_code, response_body, response_json
-        if status_local == 400 and body_local and 'max_tokens' in body_local and 'max_completion_tokens' in body_local and 'max_completion_tokens' not in payload_dict:
-            _log("Retrying with max_completion_tokens…")
-            payload_dict = dict(payload_dict)
-            payload_dict.pop('max_tokens', None)
-            payload_dict['max_completion_tokens'] = 300
-            status_local, body_local, json_local = _post(payload_dict)
-            _log(f"GPT req status={status_local}")
-        if status_local == 400 and body_local and '"param": "temperature"' in body_local and 'temperature' in payload_dict:
-            _log("Retrying without temperature…")
-            payload_dict = dict(payload_dict)
-            payload_dict.pop('temperature', None)
-            status_local, body_local, json_local = _post(payload_dict)
-            _log(f"GPT req status={status_local}")
-        return status_local, body_local, json_local, payload_dict
-    status, body, j = _post(payload)
-    _log(f"GPT req status={status}")
-    status, body, j, payload = _maybe_retry(payload, status, body, j)
-    if status != 200 or not j:
-        if body:
-            _log(f"GPT error body: {str(body)[:300]}")
-        return None
-    try:
-        return j.get('choices', [{}])[0].get('message', {}).get('content')
-    except Exception:
-        return None
-def gpt_with_prompt(prompt_md: str, user_input: str, api_key: Optional[str], base_url: Optional[str], model: Optional[str], timeout: float = 20.0, context: Optional[str] = None, context_labels: Optional[List[str]] = None) -> Optional[str]:
+    content = _retrying_post(url, headers, payload, timeout, label='GPT', budget=budget)
+    _resp_cache_put(cache_key, content)
+    return content
+def gpt_with_prompt(prompt_md: str, user_input: str, api_key: Optional[str], base_url: Optional[str], model: Optional[str], timeout: float = 20.0, context: Optional[str] = None, context_labels: Optional[List[str]] = None, on_delta: Optional[Callable[[str], None]] = None, budget: Optional[float] = None) -> Optional[str]:
     if not api_key or not model:
         return None
-    try:
-        import requests  # type: ignore
-    except Exception:
-        requests = None  # type: ignore
+    labels_key = "\n".join(context_labels[:8]) if context_labels else None
+    ctx = context[-10000:] if context else ''
+    cache_key = _resp_cache_key('prompt', base_url, model, prompt_md, user_input, ctx, labels_key)
+    cached = _resp_cache_get(cache_key)
+    if cached is not None:
+        dbg("GPT prompt cache hit")
+        if on_delta is not None:
+            on_delta(cached)
+        return cached
     url = (base_url.rstrip('/') if base_url else "https://api.openai.com/v1") + "/chat/completions"
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
     messages = [
@@ -1312,64 +1909,16 @@ def gpt_with_prompt(prompt_md: str, user_input: str, api_key: Optional[str], bas
         sources = "\n".join(f"- {lbl}" for lbl in context_labels[:8])
         messages.append({"role": "system", "content": "CONTEXT SOURCES:\n" + sources})
     if context:
-        messages.append({"role": "system", "content": ("CONTEXT (may be partial):\n" + context[-10000:])})
-        messages.append({"role": "user", "content": "Reference context (truncated):\n" + context[-8000:]})
+        messages.append({"role": "system", "content": ("CONTEXT (may be partial):\n" + ctx)})
+        messages.append({"role": "user", "content": "Reference context (truncated):\n" + ctx[-8000:]})
     messages.append({"role": "user", "content": user_input})
     payload: Dict[str, object] = {"model": model, "messages": messages, "temperature": 0.2, "max_tokens": 400}
-    try:
-        if requests is not None:
-            attempt = 0
-            while True:
-                r = requests.post(url, headers=headers, json=payload, timeout=timeout)
-                if r.status_code == 200:
-                    j = r.json()
-                    return j.get('choices', [{}])[0].get('message', {}).get('content')
-                if r.status_code == 400 and "max_tokens" in r.text and "max_completion_tokens" in r.text and 'max_completion_tokens' not in payload:
-                    payload["max_completion_tokens"] = payload.pop("max_tokens", 400)
-                    attempt += 1
-                    if attempt < 3:
-                        continue
-                if r.status_code == 400 and '"param": "temperature"' in r.text and 'temperature' in payload:
-                    payload.pop("temperature", None)
-                    attempt += 1
-                    if attempt < 3:
-                        continue
-                return None
-        else:
-            import urllib.request, urllib.error
-            def _do_request(data_dict: Dict[str, object]) -> tuple[int, str]:
-                req = urllib.request.Request(url, data=json.dumps(data_dict).encode('utf-8'), headers=headers)
-                try:
-                    with urllib.request.urlopen(req, timeout=timeout) as resp:
-                        body = resp.read().decode('utf-8')
-                        return 200, body
-                except urllib.error.HTTPError as e:
-                    body = e.read().decode('utf-8', errors='ignore')
-                    return e.code, body
-            attempt = 0
-            while True:
-                status, body = _do_request(payload)
-                if status == 200:
-                    try:
-                        j = json.loads(body)
-                    except Exception:
-                        j = None
-                    if j:
-                        return j.get('choices', [{}])[0].get('message', {}).get('content')
-                    return None
-                if status == 400 and "max_tokens" in body and "max_completion_tokens" in body and 'max_completion_tokens' not in payload:
-                    payload["max_completion_tokens"] = payload.pop("max_tokens", 400)
-                    attempt += 1
-                    if attempt < 3:
-                        continue
-                if status == 400 and '"param": "temperature"' in body and 'temperature' in payload:
-                    payload.pop("temperature", None)
-                    attempt += 1
-                    if attempt < 3:
-                        continue
-                return None
-    except Exception:
-        return None
+    if on_delta is not None:
+        # Only stream when someone shows the partial answer; the analyzer just wants the final text
+        payload["stream"] = True
+    content = _retrying_post(url, headers, payload, timeout, on_delta=on_delta, label='GPT prompt', budget=budget)
+    _resp_cache_put(cache_key, content)
+    return content
 def gpt_chat_response(
     prompt_md: str,
     question: str,
@@ -1383,18 +1932,16 @@ def gpt_chat_response(
     context_labels: Optional[List[str]] = None,
     *,
     use_full_transcript: bool = False,
+    on_delta: Optional[Callable[[str], None]] = None,
+    encoded_history: Optional[List[bytes]] = None,
 ) -> Optional[str]:
     if not api_key or not model:
         return None
-    try:
-        import requests  # type: ignore
-    except Exception:
-        requests = None  # type: ignore
     url = (base_url.rstrip('/') if base_url else "https://api.openai.com/v1") + "/chat/completions"
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
     system_prompt = prompt_md.strip() if prompt_md else "You are a real-time meeting copilot."
     system_prompt += "\nUse the latest transcript excerpts and context sources to keep answers grounded."
-    messages: List[Dict[str, str]] = [{"role": "system", "content": system_prompt}]
+    messages: List[object] = [{"role": "system", "content": system_prompt}]
     if context_labels:
         sources = "\n".join(f"- {lbl}" for lbl in context_labels[:8])
         messages.append({"role": "system", "content": "CONTEXT SOURCES:\n" + sources})
@@ -1412,79 +1959,28 @@ def gpt_chat_response(
                 if len(snippet) > 6000:
                     snippet = snippet[-6000:]
                 messages.append({"role": "system", "content": "RECENT TRANSCRIPT:\n" + snippet})
-    history_tail = chat_history[-6:]
-    for q_prev, a_prev, pending in history_tail:
-        if pending:
-            continue
-        if q_prev:
-            messages.append({"role": "user", "content": q_prev})
-        if a_prev:
-            messages.append({"role": "assistant", "content": a_prev})
+    if encoded_history is not None:
+        # Answered turns already encoded by SharedState.get_encoded_chat_history()
+        if encoded_history:
+            messages.append(_EncodedMessages(b','.join(encoded_history)))
+    else:
+        for q_prev, a_prev, pending in chat_history[-6:]:
+            if pending:
+                continue
+            if q_prev:
+                messages.append({"role": "user", "content": q_prev})
+            if a_prev:
+                messages.append({"role": "assistant", "content": a_prev})
     messages.append({"role": "user", "content": question})
     payload: Dict[str, object] = {
         "model": model,
         "messages": messages,
         "temperature": 0.2,
         "max_tokens": 500,
+        # Stream so the UI sees tokens early and long answers never idle past proxy timeouts
+        "stream": True,
     }
-    try:
-        if requests is not None:
-            attempt = 0
-            while True:
-                r = requests.post(url, headers=headers, json=payload, timeout=timeout)
-                if r.status_code == 200:
-                    j = r.json()
-                    return j.get('choices', [{}])[0].get('message', {}).get('content')
-                if r.status_code == 400 and "max_tokens" in r.text and "max_completion_tokens" in r.text and 'max_completion_tokens' not in payload:
-                    payload["max_completion_tokens"] = payload.pop("max_tokens", 500)
-                    attempt += 1
-                    if attempt < 3:
-                        continue
-                if r.status_code == 400 and '"param": "temperature"' in r.text and 'temperature' in payload:
-                    _log("Chatbot retrying without temperature")
-                    payload.pop("temperature", None)
-                    attempt += 1
-                    if attempt < 3:
-                        continue
-                _log(f"Chatbot request failed: status={r.status_code} body={r.text[:200]}")
-                return None
-        else:
-            import urllib.request, urllib.error
-            def _do_request(data_dict: Dict[str, object]) -> tuple[int, str]:
-                req = urllib.request.Request(url, data=json.dumps(data_dict).encode('utf-8'), headers=headers)
-                try:
-                    with urllib.request.urlopen(req, timeout=timeout) as resp:
-                        body = resp.read().decode('utf-8')
-                        return 200, body
-                except urllib.error.HTTPError as e:
-                    body = e.read().decode('utf-8', errors='ignore')
-                    return e.code, body
-            attempt = 0
-            while True:
-                status, body = _do_request(payload)
-                if status == 200:
-                    try:
-                        j = json.loads(body)
-                    except Exception:
-                        j = None
-                    if j:
-                        return j.get('choices', [{}])[0].get('message', {}).get('content')
-                    return None
-                if status == 400 and "max_tokens" in body and "max_completion_tokens" in body and 'max_completion_tokens' not in payload:
-                    payload["max_completion_tokens"] = payload.pop("max_tokens", 500)
-                    attempt += 1
-                    if attempt < 3:
-                        continue
-                if status == 400 and '"param": "temperature"' in body and 'temperature' in payload:
-                    payload.pop("temperature", None)
-                    attempt += 1
-                    if attempt < 3:
-                        continue
-                _log(f"Chatbot HTTPError body: {body[:200]}")
-                return None
-    except Exception as e:
-        _log(f"Chatbot call exception: {e}")
-        return None
+    return _retrying_post(url, headers, payload, timeout, on_delta=on_delta, label='Chatbot')
 
 def post_session_chat_loop(
     transcript_lines: List[str],
@@ -1540,6 +2036,33 @@ def post_session_chat_loop(
         history.append((question, answer, False))
     return logged_pairs
 
+# Keyword sniffers for the heuristic analyzer fallback (substring semantics, one scan per line)
+_Q_RE = re.compile(r"\?|^(?:who|what|why|how|when|where|do|does|did|is|are|have|has) ")
+_D_RE = re.compile("|".join(map(re.escape, (
+    'we decided', 'agreed', 'decision', 'we will', "we'll", 'we chose', 'proceed'
+))))
+_A_RE = re.compile("|".join(map(re.escape, (
+    'we need to', 'we should', 'todo', 'follow up', 'please ', 'can you', 'assign', 'schedule', 'send ', 'prepare '
+))))
+_TOK_RE = re.compile(r'[A-Za-z]{4,}')
+def _fallback_core(lines: List[str]) -> Tuple[List[str], List[str], List[str], Counter]:
+    """Single pass over stripped, non-empty lines: keyword-classified lines plus a word-frequency Counter."""
+    actions: List[str] = []
+    questions: List[str] = []
+    decisions: List[str] = []
+    q_search, d_search, a_search = _Q_RE.search, _D_RE.search, _A_RE.search
+    for l in lines:
+        low = l.lower()
+        if q_search(low):
+            questions.append(l)
+        if d_search(low):
+            decisions.append(l)
+        if a_search(low):
+            actions.append(l)
+    # Words never span lines, so tokenize the whole window in one findall
+    stopwords = SharedState._STOPWORDS
+    freq = Counter(t for t in map(str.lower, _TOK_RE.findall("\n".join(lines))) if t not in stopwords)
+    return actions, questions, decisions, freq
 def analyzer_loop(state: SharedState, api_key: Optional[str], base_url: Optional[str], model: Optional[str], stop_event: threading.Event, prompt_md: Optional[str] = None):
     def parse_blocks(s: str) -> Tuple[List[str], List[str], List[str], List[str]]:
         actions: List[str] = []
@@ -1572,55 +2095,135 @@ def analyzer_loop(state: SharedState, api_key: Optional[str], base_url: Optional
                 topics.extend([t.strip() for t in text.split(',') if t.strip()]) if ',' in text else topics.append(text)
         return actions, questions, decisions, topics
     def fallback(snippet: str) -> Tuple[List[str], List[str], List[str], List[str]]:
-        import re
-        actions: List[str] = []
-        questions: List[str] = []
-        decisions: List[str] = []
-        freq = {}
-        for l in [x.strip() for x in snippet.splitlines() if x.strip()]:
-            low = l.lower()
-            if '?' in l or low.startswith((
-                'who ', 'what ', 'why ', 'how ', 'when ', 'where ',
-                'do ', 'does ', 'did ', 'is ', 'are ', 'have ', 'has '
-            )):
-                questions.append(l)
-            if any(k in low for k in (
-                'we decided', 'agreed', 'decision', 'we will', "we'll", 'we chose', 'proceed'
-            )):
-                decisions.append(l)
-            if any(k in low for k in (
-                'we need to', 'we should', 'todo', 'follow up', 'please ', 'can you', 'assign', 'schedule', 'send ', 'prepare '
-            )):
-                actions.append(l)
-            for tok in [t.lower() for t in re.findall(r'[A-Za-z]+', l) if len(t) >= 4]:
-                if tok in SharedState._STOPWORDS:
-                    continue
-                freq[tok] = freq.get(tok, 0) + 1
-        topics = [t for t, _ in sorted(freq.items(), key=lambda kv: (-kv[1], kv[0]))[:10]]
+        actions, questions, decisions, freq = _fallback_core([x.strip() for x in snippet.splitlines() if x.strip()])
+        # Top 10 by (count desc, word) via a bounded heap rather than sorting the whole vocabulary
+        topics = [t for t, _ in heapq.nsmallest(10, freq.items(), key=lambda kv: (-kv[1], kv[0]))]
         return actions[:5], questions[:5], decisions[:5], topics
-    while not stop_event.is_set():
-        transcript, _, partial = state.snapshot_tail(120)
-        snippet = ("\n".join(transcript[-60:]) + ("\n" + partial if partial else "")).strip()
-        if snippet:
-            dbg(f"Analyzer tick: snippet_len={len(snippet)} use_prompt={bool(prompt_md)}")
-            analysis = None
-            ctx_text, ctx_labels = state.get_context()
-            ctx_text = ctx_text or None
-            ctx_labels = ctx_labels or None
-            if prompt_md:
-                analysis = gpt_with_prompt(prompt_md, snippet, api_key, base_url, model, context=ctx_text, context_labels=ctx_labels)
-            if analysis is None:
-                analysis = gpt_analyze(snippet, api_key, base_url, model, context=ctx_text, context_labels=ctx_labels)
-            if analysis:
-                a, q, d, t = parse_blocks(analysis)
-                state.add_analysis_chunks(a, q, d, t)
-                state.set_analysis(analysis)
-                dbg(f"Analyzer updated: a={len(a)} q={len(q)} d={len(d)} t={len(t)}")
-            else:
-                a, q, d, t = fallback(snippet)
-                state.add_analysis_chunks(a, q, d, t)
-                dbg(f"Analyzer fallback used: a={len(a)} q={len(q)} d={len(d)} t={len(t)}")
-        stop_event.wait(5.0)
+    llm_wait = 30.0  # also passed as each call's retry budget, so retries end inside the wait
+    def await_llm(fut) -> Optional[str]:
+        try:
+            return fut.result(timeout=llm_wait)
+        except Exception as e:
+            # A call that overruns keeps its worker; its late result is dropped and no new call starts until it ends
+            _log(f"Analyzer LLM call failed: {type(e).__name__}: {e}")
+            return None
+    # One worker: at most one LLM call is in flight, so an outage cannot pile up retrying calls
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='analyzer')
+    inflight = None
+    last_key = None  # (snippet digest, context tail) of the last tick the LLM answered
+    silence_streak = 0
+    try:
+        while not stop_event.is_set():
+            tail, partial = state.snapshot_tail_text()
+            snippet = (tail + ("\n" + partial if partial else "")).strip()
+            if snippet:
+                # The prompt/analyze helpers read at most the last 10k chars of context
+                ctx_text, ctx_labels = state.get_context_tail(10000)
+                key = (hashlib.blake2b(snippet.encode('utf-8', 'surrogatepass'), digest_size=8).digest(), ctx_text)
+                if key == last_key:
+                    # Nothing new was said: skip the call and back off 5s -> 30s while it stays quiet
+                    silence_streak += 1
+                    stop_event.wait(min(30.0, 5.0 * (1 + silence_streak // 2)))
+                    continue
+                silence_streak = 0
+                dbg(f"Analyzer tick: snippet_len={len(snippet)} use_prompt={bool(prompt_md)}")
+                analysis = None
+                ctx_text = ctx_text or None
+                ctx_labels = ctx_labels or None
+                if prompt_md and (inflight is None or inflight.done()):
+                    inflight = pool.submit(gpt_with_prompt, prompt_md, snippet, api_key, base_url, model, context=ctx_text, context_labels=ctx_labels, budget=llm_wait)
+                    analysis = await_llm(inflight)
+                if analysis is None and (inflight is None or inflight.done()):
+                    inflight = pool.submit(gpt_analyze, snippet, api_key, base_url, model, context=ctx_text, context_labels=ctx_labels, budget=llm_wait)
+                    analysis = await_llm(inflight)
+                if analysis:
+                    a, q, d, t = parse_blocks(analysis)
+                    state.add_analysis_chunks(a, q, d, t)
+                    state.set_analysis(analysis)
+                    last_key = key
+                    dbg(f"Analyzer updated: a={len(a)} q={len(q)} d={len(d)} t={len(t)}")
+                else:
+                    # Leave last_key alone so the same snippet is retried on the next tick
+                    a, q, d, t = fallback(snippet)
+                    state.add_analysis_chunks(a, q, d, t)
+                    dbg(f"Analyzer fallback used: a={len(a)} q={len(q)} d={len(d)} t={len(t)}")
+            stop_event.wait(5.0)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+QUESTION_PHRASES = [
+    'what are', 'what is', 'what do', 'what did', 'what can', 'what should', 'what would',
+    'how do', 'how did', 'how can', 'how should', 'how would', 'how are', 'how is',
+    'why is', 'why are', 'why do', 'why did',
+    'when is', 'when are', 'when will',
+    'where is', 'where are',
+    'who is', 'who are', 'who will',
+    'can we', 'can you', 'can i',
+    'could we', 'could you',
+    'should we', 'should you',
+    'would we', 'would you',
+    'did we', 'did you', 'do we', 'do you',
+    'have we', 'have you', 'has anyone',
+    'is that', 'is there', 'are we', 'are there',
+    'will we', 'will you', 'will it',
+]
+_QUESTION_LEADS = (
+    'who', 'what', 'when', 'where', 'why', 'how',
+    'do', 'does', 'did', 'is', 'are', 'can', 'could',
+    'should', 'would', 'have', 'has', 'will',
+)
+# Leading interrogative word, or any phrase as whole words anywhere (runs of whitespace count as one space)
+_QUESTION_RE = re.compile(
+    r'^(?:' + '|'.join(_QUESTION_LEADS) + r')\s'
+    r'|(?<!\S)(?:' + '|'.join(r'\s+'.join(map(re.escape, p.split())) for p in QUESTION_PHRASES) + r')(?!\S)'
+)
+def _greedy_wrap(text: str, width: int) -> List[str]:
+    """Greedy word wrap for the TUI; matches textwrap.wrap on single-spaced prose except it never splits at hyphens.
+
+    Leading indentation is kept on the first row (so nested bullets stay nested); runs of whitespace
+    after it collapse to one space. Works on slice indices: each row is found with one rfind inside
+    a width-sized window, so a long paragraph costs O(len) rather than a per-word rebuild.
+    """
+    width = max(1, width)
+    s = ' '.join(text.split())
+    if not s:
+        return []
+    lead = 0
+    if text[0].isspace():
+        head = text[:len(text) - len(text.lstrip())].expandtabs()
+        # An indent that fills the row would only push words onto blank rows
+        lead = len(head) if len(head) < width else 0
+        s = ' ' * lead + s
+    n = len(s)
+    out: List[str] = []
+    i = 0
+    while i < n:
+        if n - i <= width:
+            out.append(s[i:])
+            break
+        j = s.rfind(' ', i if i else lead, i + width + 1)
+        if j < 0 and i == 0 and lead:
+            end = s.find(' ', lead)
+            if (n if end < 0 else end) - lead <= width:
+                # The first word fits a row but not after the indent: textwrap drops the indent-only row
+                i = lead
+                continue
+        if j < 0:
+            # Over-long word at the start of a row: hard-break like textwrap's break_long_words
+            cut = i + width
+        else:
+            end = s.find(' ', j + 1)
+            if end < 0:
+                end = n
+            # An over-long next word fills the rest of this row when there is room after a space
+            cut = i + width if end - j - 1 > width and j - i + 1 < width else j
+        out.append(s[i:cut])
+        i = cut + 1 if cut < n and s[cut] == ' ' else cut
+    return out
+_FOOTER_TAIL = "  q Quit  m Mark  n Note  c Chat  C Context  Tab focus  Esc back  / search (n/N next/prev)  \\ filter  j/k scroll   t="
+@functools.lru_cache(maxsize=8192)
+def _wrap_cached(text: str, width: int) -> Tuple[str, ...]:
+    """Memoized _greedy_wrap (never empty) for rows re-wrapped on every repaint; width is part of the key."""
+    return tuple(_greedy_wrap(text, width)) or ("",)
 def run_curses_ui(source: str, sink: Optional[str], vosk_label: str, llm_model: Optional[str], state: SharedState, tr: LiveTranscriber, reader_thread: threading.Thread, *, interview_mode: bool = False, interview_prompt: Optional[str] = None, api_key: Optional[str] = None, base_url: Optional[str] = None, chat_prompt: Optional[str] = None, chat_prompt_label: Optional[str] = None, initial_newest_first: bool = True):
     def init_colors():
         if not curses.has_colors():
@@ -1652,41 +2255,10 @@ def run_curses_ui(source: str, sink: Optional[str], vosk_label: str, llm_model:
         # Partial: dimmed yellow text on default
         curses.init_pair(pairs['partial'], curses.COLOR_YELLOW, -1)
         return pairs
-    QUESTION_PHRASES = [
-        'what are', 'what is', 'what do', 'what did', 'what can', 'what should', 'what would',
-        'how do', 'how did', 'how can', 'how should', 'how would', 'how are', 'how is',
-        'why is', 'why are', 'why do', 'why did',
-        'when is', 'when are', 'when will',
-        'where is', 'where are',
-        'who is', 'who are', 'who will',
-        'can we', 'can you', 'can i',
-        'could we', 'could you',
-        'should we', 'should you',
-        'would we', 'would you',
-        'did we', 'did you', 'do we', 'do you',
-        'have we', 'have you', 'has anyone',
-        'is that', 'is there', 'are we', 'are there',
-        'will we', 'will you', 'will it',
-    ]
+    @functools.lru_cache(maxsize=8192)
     def looks_like_question(raw: str) -> bool:
         text = (raw or '').strip()
-        if not text:
-            return False
-        if '?' in text:
-            return True
-        low = ' '.join(text.lower().split())
-        for prefix in (
-            'who', 'what', 'when', 'where', 'why', 'how',
-            'do', 'does', 'did', 'is', 'are', 'can', 'could',
-            'should', 'would', 'have', 'has', 'will'
-        ):
-            if low.startswith(prefix + ' '):
-                return True
-        padded = f' {low} '
-        for phrase in QUESTION_PHRASES:
-            if f' {phrase} ' in padded:
-                return True
-        return False
+        return bool(text) and ('?' in text or _QUESTION_RE.search(text.lower()) is not None)
     def wrap_bulleted(lines: List[str], width: int, bullet: str = "- ") -> List[Tuple[str, bool]]:
         """Wrap lines as bulleted blocks with a blank spacer between blocks.
         Returns (line_text, is_question) tuples so the caller can style questions.
@@ -1701,8 +2273,7 @@ def run_curses_ui(source: str, sink: Optional[str], vosk_label: str, llm_model:
             highlight = looks_like_question(raw)
             first = True
             wrap_width = max(1, width - len(bullet))
-            wrapped = textwrap.wrap(raw, wrap_width) or [""]
-            for seg in wrapped:
+            for seg in _wrap_cached(raw, wrap_width):
                 if first:
                     out.append((bullet + seg, highlight))
                     first = False
@@ -1713,9 +2284,26 @@ def run_curses_ui(source: str, sink: Optional[str], vosk_label: str, llm_model:
     def _ui(stdscr):
         curses.curs_set(0)
         stdscr.nodelay(True)
-        stdscr.timeout(200)
+        # Short input poll; idle ticks are cheap because every region is dirty-checked before painting
+        poll_ms = 20
+        stdscr.timeout(poll_ms)
         base_title = f"Src: {source}  Sink: {sink or '-'}  ASR: {vosk_label}  LLM: {llm_model or '-'}"
         pairs = init_colors()
+        # Attributes are fixed once colors are initialised; resolve them once instead of per frame
+        def _pair(name: str, extra: int = 0, fallback: int = 0) -> int:
+            return (curses.color_pair(pairs[name]) | extra) if pairs else fallback
+        ATTR = {
+            'title': _pair('title', curses.A_BOLD, curses.A_REVERSE),
+            'footer': _pair('footer', 0, curses.A_REVERSE),
+            'sep': _pair('sep'),
+            'partial': _pair('partial', curses.A_DIM, curses.A_DIM),
+            'left': _pair('left'),
+            'left_q': _pair('left', curses.A_BOLD | curses.A_UNDERLINE, curses.A_BOLD | curses.A_UNDERLINE),
+            'right': _pair('right'),
+            'right_bold': _pair('right', curses.A_BOLD, curses.A_BOLD),
+            'right_dim': _pair('right', curses.A_DIM, curses.A_DIM),
+            'right_rev': _pair('right', curses.A_REVERSE, curses.A_REVERSE),
+        }
         msg_queue: queue.Queue[Tuple[str, float, bool]] = queue.Queue()
         status_message = ""
         status_expire = 0.0
@@ -1723,7 +2311,9 @@ def run_curses_ui(source: str, sink: Optional[str], vosk_label: str, llm_model:
         def push_status(msg: str, duration: float = 4.0, sticky: bool = False):
             msg_queue.put((msg, duration, sticky))
         note_mode = False
-        note_buffer = ""
+        # Typed note characters, joined only on submit; note_ver tells the footer the text changed
+        note_chars: List[str] = []
+        note_ver = 0
         left_offset = 0
         left_follow = True
         newest_first = bool(initial_newest_first)  # render newest finalized blocks at the top by default
@@ -1735,7 +2325,40 @@ def run_curses_ui(source: str, sink: Optional[str], vosk_label: str, llm_model:
         active_pane = 'left'
         right_offset = 0
         right_follow = True
+        transcript: List[str] = []
+        tx_version = -1
+        # Wrapped bullet rows only change with the transcript, the ordering or the pane width
+        bullet_lines: List[Tuple[str, bool]] = []
+        bullet_key = None
+        # Lower-cased bullet text for search, built on first use after bullet_lines changes
+        bullet_lower: List[str] = []
+        bullet_lower_key = None
+        def lowered_bullets() -> List[str]:
+            nonlocal bullet_lower, bullet_lower_key
+            if bullet_lower_key != bullet_key:
+                bullet_lower = [seg.lower() for seg, _ in bullet_lines]
+                bullet_lower_key = bullet_key
+            return bullet_lower
+        # Sorted bullet indices matching the search, so n/N bisect instead of rescanning the ring
+        search_matches: List[int] = []
+        search_matches_key = None
+        def search_hit(ql: str, row: str) -> bool:
+            # A leading '^' anchors the query at the start of a transcript line: a "• " row, just after the bullet
+            if ql.startswith('^') and len(ql) > 1:
+                return row.startswith('• ') and row.startswith(ql[1:], 2)
+            return ql in row
+        def match_indices(ql: str) -> List[int]:
+            nonlocal search_matches, search_matches_key
+            if search_matches_key != (bullet_key, ql):
+                if ql.startswith('^') and len(ql) > 1:
+                    prefix = ql[1:]
+                    search_matches = [i for i, seg in enumerate(lowered_bullets()) if seg.startswith('• ') and seg.startswith(prefix, 2)]
+                else:
+                    search_matches = [i for i, seg in enumerate(lowered_bullets()) if ql in seg]
+                search_matches_key = (bullet_key, ql)
+            return search_matches
         def prompt_line(prompt_text: str) -> str:
+            nonlocal footer_key
             h, w = stdscr.getmaxyx()
             curses.curs_set(1)
             curses.echo()
@@ -1751,7 +2374,64 @@ def run_curses_ui(source: str, sink: Optional[str], vosk_label: str, llm_model:
                 return ""
             finally:
                 curses.noecho(); curses.curs_set(0)
-                stdscr.nodelay(True); stdscr.timeout(200)
+                stdscr.nodelay(True); stdscr.timeout(poll_ms)
+                footer_key = None  # the prompt overwrote the footer row
+        # Left pane layout:
+        # - Top: live partial stream (word-wrapped) with dim style
+        # - Spacer
+        # - Below: finalized transcript as bulleted, word-wrapped blocks
+        def wrap_with_prefix(text: str, width: int, prefix: str = "… ") -> List[str]:
+            if not text:
+                return []
+            width = max(1, width)
+            body_w = max(1, width - len(prefix))
+            parts = _greedy_wrap(text, body_w) or [""]
+            out = []
+            for i, seg in enumerate(parts):
+                if i == 0:
+                    out.append(prefix + seg)
+                else:
+                    out.append(" " * len(prefix) + seg)
+            return out
+        # Dirty tracking: each region is repainted only when its inputs changed since the last frame
+        screen_size = None
+        title_key = left_key = right_key = footer_key = None
+        analysis = partial = ""
+        partial_ver = analysis_ver = -1
+        chat_ver = -1
+        chat_history: List[Tuple[str, Optional[str], bool]] = []
+        chat_pending = False
+        context_text_current, context_label_list = "", []
+        available_rows = 0
+        # Scroll bounds from the last paint, shared by the key handlers
+        max_offset_left = 0
+        max_offset_right = 0
+        # Last (text, attr) painted on each body row per pane; rows that match are not rewritten
+        left_rows_drawn: List[Optional[Tuple[str, int]]] = []
+        right_lines: List[Tuple[str, int]] = []
+        right_lines_key = None
+        # Rendered rows per chat exchange (by history index); only new or changed exchanges are re-wrapped
+        chat_rows: Dict[int, Tuple[tuple, List[Tuple[str, int]]]] = {}
+        analysis_rows: List[Tuple[str, int]] = []
+        analysis_rows_key = None
+        header_text = ""
+        header_key = None
+        blank_visible = curses.A_REVERSE | curses.A_UNDERLINE | curses.A_STANDOUT
+        def put_row(win, y: int, text: str, n: int, attr: int):
+            """Write text and blank the rest of an n-wide row, in one call unless attr shows on blank cells."""
+            if not attr & blank_visible:
+                win.addnstr(y, 0, text.ljust(n), n, attr)
+                return
+            win.addnstr(y, 0, text, n, attr)
+            if len(text) < n:
+                win.addnstr(y, len(text), " " * (n - len(text)), n - len(text))
+        # Pane and footer windows, recreated on resize; each stages its own changes before one doupdate()
+        left_win = right_win = foot_win = stdscr
+        right_rows_drawn: List[Optional[Tuple[str, int]]] = []
+        chat_available = bool(chat_prompt and api_key and llm_model)
+        elapsed_sec = -1
+        elapsed = ""
+        ch = -1
         dbg("TUI started")
         while not tr.stop_event.is_set():
             h, w = stdscr.getmaxyx()
@@ -1765,7 +2445,6 @@ def run_curses_ui(source: str, sink: Optional[str], vosk_label: str, llm_model:
                 pass
             if status_message and not status_requires_ack and time.time() > status_expire:
                 status_message = ""
-            context_text_current, context_label_list = state.get_context()
             title_h = 1
             footer_h = 1
             body_h = max(1, h - title_h - footer_h)
@@ -1774,153 +2453,199 @@ def run_curses_ui(source: str, sink: Optional[str], vosk_label: str, llm_model:
             left_w = int(w * 0.58)
             left_w = max(min_pane, min(w - min_pane, left_w)) if w >= (min_pane * 2) else max(1, w - 1)
             right_w = max(1, w - left_w)
-            stdscr.erase()
-            focus_label = 'Transcript' if active_pane == 'left' else 'Analysis'
-            title = f"{base_title}  Focus:{focus_label}"
-            maxw = max(1, w - 1)
-            if pairs:
-                stdscr.addnstr(0, 0, title[:maxw], maxw, curses.color_pair(pairs['title']) | curses.A_BOLD)
-            else:
-                stdscr.addnstr(0, 0, title[:maxw], maxw, curses.A_REVERSE)
-            transcript, analysis, partial = state.snapshot()
-            chat_history = state.get_chat_history()
-            chat_available = bool(chat_prompt and api_key and llm_model)
-            chat_pending = state.has_pending_chat() if chat_available else False
-            # Left pane layout:
-            # - Top: live partial stream (word-wrapped) with dim style
-            # - Spacer
-            # - Below: finalized transcript as bulleted, word-wrapped blocks
-            def wrap_with_prefix(text: str, width: int, prefix: str = "… ") -> List[str]:
-                if not text:
-                    return []
-                width = max(1, width)
-                body_w = max(1, width - len(prefix))
-                parts = textwrap.wrap(text, body_w) or [""]
-                out = []
-                for i, seg in enumerate(parts):
-                    if i == 0:
-                        out.append(prefix + seg)
+            queued = -1
+            if ch != -1:
+                # Coalesce bursts (pastes, key repeat): handle every queued key before painting once
+                stdscr.timeout(0)
+                try:
+                    queued = stdscr.getch()
+                except Exception:
+                    queued = -1
+                stdscr.timeout(poll_ms)
+                if queued != -1:
+                    curses.ungetch(queued)
+            if queued == -1:
+                if screen_size != (h, w):
+                    stdscr.erase()
+                    screen_size = (h, w)
+                    left_win = curses.newwin(body_h, left_w, 1, 0)
+                    right_win = curses.newwin(body_h, right_w, 1, left_w)
+                    foot_win = curses.newwin(1, w, h - 1, 0)
+                    title_key = left_key = right_key = footer_key = None
+                    left_rows_drawn = [None] * body_h
+                    right_rows_drawn = [None] * body_h
+                    # Vertical separator (with color if available)
+                    try:
+                        if pairs:
+                            left_win.attron(ATTR['sep'])
+                        left_win.vline(0, left_w - 1, curses.ACS_VLINE, body_h)
+                        if pairs:
+                            left_win.attroff(ATTR['sep'])
+                    except Exception:
+                        pass
+                tx_ver_now, partial_ver_now, analysis_ver_now, chat_ver_now = state.render_versions()
+                if tx_ver_now != tx_version or partial_ver_now != partial_ver or analysis_ver_now != analysis_ver:
+                    tx_latest, analysis, partial, tx_version = state.snapshot_since(tx_version)
+                    if tx_latest is not None:
+                        transcript = tx_latest
+                    if analysis_ver_now != analysis_ver:
+                        context_text_current, context_label_list = state.get_context()
+                    partial_ver, analysis_ver = partial_ver_now, analysis_ver_now
+                if chat_ver_now != chat_ver:
+                    chat_history = state.get_chat_history()
+                    chat_pending = state.has_pending_chat() if chat_available else False
+                    chat_ver = chat_ver_now
+                focus_label = 'Transcript' if active_pane == 'left' else 'Analysis'
+                maxw = max(1, w - 1)
+                if title_key != focus_label:
+                    title = f"{base_title}  Focus:{focus_label}"
+                    stdscr.move(0, 0)
+                    stdscr.clrtoeol()
+                    stdscr.addnstr(0, 0, title[:maxw], maxw, ATTR['title'])
+                    title_key = focus_label
+                key = (tx_version, partial_ver, newest_first, left_offset, left_follow, active_search)
+                if left_key != key:
+                    left_key = key
+                    rows: List[Tuple[str, int]] = []
+                    # 1) Partial (live stream) at the top
+                    partial_lines: List[str] = wrap_with_prefix(partial or "", left_w - 2) if partial else []
+                    for pl in partial_lines[:body_h]:
+                        rows.append((pl[: left_w - 2], ATTR['partial']))
+                    # Spacer line between partial and bullets
+                    if partial_lines and len(rows) < body_h:
+                        rows.append(("", 0))
+                    # 2) Bulleted finalized transcript below
+                    available_rows = body_h - len(rows)
+                    if bullet_key != (tx_version, newest_first, left_w):
+                        source_lines = list(reversed(transcript)) if newest_first else list(transcript)
+                        bullet_lines = wrap_bulleted(source_lines, left_w - 2, bullet="• ")
+                        bullet_key = (tx_version, newest_first, left_w)
+                    max_offset_left = max(0, len(bullet_lines) - available_rows)
+                    if left_follow:
+                        left_offset = 0 if newest_first else max_offset_left
                     else:
-                        out.append(" " * len(prefix) + seg)
-                return out
-            y = 1
-            # 1) Partial (live stream) at the top
-            partial_lines: List[str] = wrap_with_prefix(partial or "", left_w - 2) if partial else []
-            for pl in partial_lines:
-                if y >= 1 + body_h:
-                    break
-                attr = (curses.color_pair(pairs['partial']) | curses.A_DIM) if pairs else curses.A_DIM
-                stdscr.addnstr(y, 0, pl[: left_w - 2], left_w - 2, attr)
-                y += 1
-            # Spacer line between partial and bullets
-            if partial_lines and y < 1 + body_h:
-                y += 1
-            # 2) Bulleted finalized transcript below
-            available_rows = max(0, (1 + body_h) - y)
-            source_lines = list(reversed(transcript)) if newest_first else list(transcript)
-            bullet_lines = wrap_bulleted(source_lines, left_w - 2, bullet="• ")
-            max_offset = max(0, len(bullet_lines) - available_rows)
-            if left_follow:
-                left_offset = 0 if newest_first else max_offset
-            else:
-                left_offset = max(0, min(left_offset, max_offset))
-            view_lines = bullet_lines[left_offset:left_offset + available_rows]
-            for seg, is_question in view_lines:
-                if y >= 1 + body_h:
-                    break
-                attr = curses.color_pair(pairs['left']) if pairs else 0
-                if is_question:
-                    attr |= curses.A_BOLD | curses.A_UNDERLINE
-                if active_search and active_search.lower() in seg.lower():
-                    attr |= curses.A_REVERSE
-                stdscr.addnstr(y, 0, seg[: left_w - 2], left_w - 2, attr)
-                y += 1
-            # Vertical separator (with color if available)
-            try:
-                if pairs:
-                    stdscr.attron(curses.color_pair(pairs['sep']))
-                stdscr.vline(1, left_w - 1, curses.ACS_VLINE, body_h)
-                if pairs:
-                    stdscr.attroff(curses.color_pair(pairs['sep']))
-            except Exception:
-                pass
-            # Right pane: analysis
-            right_x = left_w
-            right_lines: List[Tuple[str, int]] = []
-            def color(name: str, extra: int = 0) -> int:
-                return (curses.color_pair(pairs[name]) | extra) if pairs else extra
-            def add_wrapped_right(text: str, attr: int):
-                for seg in textwrap.wrap(text, right_w - 1) or [""]:
-                    right_lines.append((seg, attr))
-            def add_right_blank():
-                right_lines.append(("", color('right')))
-            header_parts: List[str] = []
-            if not tr.has_vosk:
-                header_parts.append("ASR disabled (recording only)")
-            if interview_mode:
-                status = "capturing" if capturing else ("answering" if answering else "idle")
-                header_parts.append(f"Interview: {status}")
-            if state.is_paused():
-                header_parts.append("Paused")
-            if context_text_current or context_label_list:
-                header_parts.append(f"CTX: {len(context_label_list)}" if context_label_list else "CTX:on")
-            if chat_available:
-                status = 'pending' if chat_pending else ('ready' if chat_history else 'idle')
-                header_parts.append(f"Chat: {status}")
-            if header_parts:
-                add_wrapped_right(" · ".join(header_parts), color('right', curses.A_BOLD))
-                add_right_blank()
-            if status_message:
-                add_wrapped_right(status_message, color('right', curses.A_REVERSE))
-                add_right_blank()
-            initial_text = analysis or "Waiting for analysis..."
-            for line in initial_text.splitlines():
-                add_wrapped_right(line, color('right'))
-            if chat_history:
-                add_right_blank()
-                header = "Chatbot"
-                if chat_prompt_label and chat_prompt_label != 'builtin.chatbot':
-                    label = chat_prompt_label
-                    if os.path.sep in label:
-                        label = os.path.basename(label)
-                    header = f"Chatbot [{label}]"
-                add_wrapped_right(header, color('right', curses.A_BOLD))
-                for q, a, pending in chat_history[-12:]:
-                    add_wrapped_right(f"You> {q}" if q else "You> (blank question)", color('right'))
-                    ans_text = "…" if pending else (a or "(No answer)")
-                    attr = color('right', curses.A_DIM) if pending else color('right')
-                    add_wrapped_right(f"Bot> {ans_text}", attr)
-                    add_right_blank()
-            available_right_rows = body_h
-            max_offset_right = max(0, len(right_lines) - available_right_rows)
-            if right_follow:
-                right_offset = max_offset_right
-            else:
-                right_offset = max(0, min(right_offset, max_offset_right))
-            ry = 1
-            for idx in range(right_offset, min(len(right_lines), right_offset + available_right_rows)):
-                text, attr = right_lines[idx]
-                stdscr.addnstr(ry, right_x, text[: right_w - 1], right_w - 1, attr)
-                ry += 1
-            while ry < 1 + body_h:
-                stdscr.move(ry, right_x)
-                stdscr.clrtoeol()
-                ry += 1
-            # Footer with elapsed time and key hints
-            elapsed = time.strftime('%H:%M:%S', time.gmtime(time.time() - tr.start_time))
-            footer = f"Focus:{focus_label}  q Quit  m Mark  n Note  c Chat  C Context  Tab focus  Esc back  / search (n/N next/prev)  \\ filter  j/k scroll   t={elapsed}"
-            if note_mode:
-                ft = f"note> {note_buffer}"[: max(1, w-1)]
-                if pairs:
-                    stdscr.addnstr(h - 1, 0, ft, max(1, w-1), curses.color_pair(pairs['footer']))
-                else:
-                    stdscr.addnstr(h - 1, 0, ft, max(1, w-1), curses.A_REVERSE)
-            else:
-                if pairs:
-                    stdscr.addnstr(h - 1, 0, footer[:max(1, w-1)], max(1, w-1), curses.color_pair(pairs['footer']))
-                else:
-                    stdscr.addnstr(h - 1, 0, footer[:max(1, w-1)], max(1, w-1), curses.A_REVERSE)
-            stdscr.refresh()
+                        left_offset = max(0, min(left_offset, max_offset_left))
+                    view_lines = bullet_lines[left_offset:left_offset + available_rows]
+                    view_lower = lowered_bullets()[left_offset:left_offset + available_rows] if active_search else None
+                    ql = active_search.lower()
+                    for k, (seg, is_question) in enumerate(view_lines):
+                        attr = ATTR['left_q'] if is_question else ATTR['left']
+                        if view_lower is not None and search_hit(ql, view_lower[k]):
+                            attr |= curses.A_REVERSE
+                        rows.append((seg[: left_w - 2], attr))
+                    rows.extend([("", 0)] * (body_h - len(rows)))
+                    for i, row in enumerate(rows):
+                        if left_rows_drawn[i] == row:
+                            continue
+                        left_rows_drawn[i] = row
+                        put_row(left_win, i, row[0], max(1, left_w - 1), row[1])
+                paused_now = state.is_paused()
+                # Right pane rows are rebuilt only when their content changes; scrolling just repaints
+                content_key = (analysis_ver, chat_ver, paused_now, status_message, capturing, answering, right_w)
+                key = (content_key, right_offset, right_follow)
+                if right_key != key:
+                    right_key = key
+                    # Right pane: analysis
+                    if right_lines_key != content_key:
+                        right_lines_key = content_key
+                        right_lines = []
+                        # Bind the pane's attributes and wrap width once for the per-line calls below
+                        attr_right, attr_bold, attr_dim, attr_rev = ATTR['right'], ATTR['right_bold'], ATTR['right_dim'], ATTR['right_rev']
+                        wrap_w = right_w - 1
+                        blank_row = ("", attr_right)
+                        def add_wrapped_right(text: str, attr: int):
+                            right_lines.extend((seg, attr) for seg in _wrap_cached(text, wrap_w))
+                        def add_right_blank():
+                            right_lines.append(blank_row)
+                        # Status header, re-joined only when one of the flags it shows changes
+                        hkey = (tr.has_vosk, interview_mode, capturing, answering, paused_now, bool(context_text_current), len(context_label_list), chat_available, chat_pending, bool(chat_history))
+                        if header_key != hkey:
+                            header_key = hkey
+                            header_parts: List[str] = []
+                            if not tr.has_vosk:
+                                header_parts.append("ASR disabled (recording only)")
+                            if interview_mode:
+                                status = "capturing" if capturing else ("answering" if answering else "idle")
+                                header_parts.append(f"Interview: {status}")
+                            if paused_now:
+                                header_parts.append("Paused")
+                            if context_text_current or context_label_list:
+                                header_parts.append(f"CTX: {len(context_label_list)}" if context_label_list else "CTX:on")
+                            if chat_available:
+                                status = 'pending' if chat_pending else ('ready' if chat_history else 'idle')
+                                header_parts.append(f"Chat: {status}")
+                            header_text = " · ".join(header_parts)
+                        if header_text:
+                            add_wrapped_right(header_text, attr_bold)
+                            add_right_blank()
+                        if status_message:
+                            add_wrapped_right(status_message, attr_rev)
+                            add_right_blank()
+                        # The analysis block is re-split only when the analysis itself changed, not per chat delta
+                        if analysis_rows_key != (analysis_ver, wrap_w):
+                            analysis_rows_key = (analysis_ver, wrap_w)
+                            initial_text = analysis or "Waiting for analysis..."
+                            analysis_rows = [(seg, attr_right) for line in initial_text.splitlines() for seg in _wrap_cached(line, wrap_w)]
+                        right_lines.extend(analysis_rows)
+                        if chat_history:
+                            add_right_blank()
+                            header = "Chatbot"
+                            if chat_prompt_label and chat_prompt_label != 'builtin.chatbot':
+                                label = chat_prompt_label
+                                if os.path.sep in label:
+                                    label = os.path.basename(label)
+                                header = f"Chatbot [{label}]"
+                            add_wrapped_right(header, attr_bold)
+                            start = max(0, len(chat_history) - 12)
+                            for ci in [ci for ci in chat_rows if ci < start]:
+                                del chat_rows[ci]
+                            for ci in range(start, len(chat_history)):
+                                entry = chat_history[ci]
+                                cached = chat_rows.get(ci)
+                                if cached is None or cached[0] != (entry, wrap_w):
+                                    q, a, pending = entry
+                                    ans_text = (f"{a} …" if a else "…") if pending else (a or "(No answer)")
+                                    attr = attr_dim if pending else attr_right
+                                    entry_rows = [(seg, attr_right) for seg in _wrap_cached(f"You> {q}" if q else "You> (blank question)", wrap_w)]
+                                    entry_rows.extend((seg, attr) for seg in _wrap_cached(f"Bot> {ans_text}", wrap_w))
+                                    entry_rows.append(blank_row)
+                                    cached = chat_rows[ci] = ((entry, wrap_w), entry_rows)
+                                right_lines.extend(cached[1])
+                    available_right_rows = body_h
+                    max_offset_right = max(0, len(right_lines) - available_right_rows)
+                    if right_follow:
+                        right_offset = max_offset_right
+                    else:
+                        right_offset = max(0, min(right_offset, max_offset_right))
+                    # right_lines is already wrapped to right_w - 1, so its tuples are painted as-is
+                    rows = right_lines[right_offset:right_offset + available_right_rows]
+                    rows.extend([("", 0)] * (body_h - len(rows)))
+                    for i, row in enumerate(rows):
+                        if right_rows_drawn[i] == row:
+                            continue
+                        right_rows_drawn[i] = row
+                        put_row(right_win, i, row[0], right_w - 1, row[1])
+                # Footer with elapsed time and key hints; the clock text is only formatted when the second ticks
+                sec = int(time.time() - tr.start_time)
+                if sec != elapsed_sec:
+                    elapsed_sec = sec
+                    elapsed = time.strftime('%H:%M:%S', time.gmtime(sec))
+                key = (note_ver if note_mode else None, focus_label, elapsed_sec)
+                if footer_key != key:
+                    footer_key = key
+                    if note_mode:
+                        ft = ("note> " + "".join(note_chars[:maxw]))[:maxw]
+                    else:
+                        ft = ("Focus:" + focus_label + _FOOTER_TAIL + elapsed)[:maxw]
+                    foot_win.move(0, 0)
+                    foot_win.clrtoeol()
+                    foot_win.addnstr(0, 0, ft, maxw, ATTR['footer'])
+                # Stage the touched regions and flush them to the terminal in one write
+                stdscr.noutrefresh()
+                left_win.noutrefresh()
+                right_win.noutrefresh()
+                foot_win.noutrefresh()
+                curses.doupdate()
             try:
                 ch = stdscr.getch()
             except Exception:
@@ -1928,18 +2653,21 @@ def run_curses_ui(source: str, sink: Optional[str], vosk_label: str, llm_model:
             if ch == -1:
                 continue
             if note_mode:
+                note_ver += 1
                 if ch in (10, 13):  # Enter
-                    if note_buffer.strip():
-                        tr.add_note(note_buffer.strip())
+                    note_text = "".join(note_chars).strip()
+                    if note_text:
+                        tr.add_note(note_text)
                     note_mode = False
-                    note_buffer = ""
+                    note_chars = []
                 elif ch in (27,):  # ESC
                     note_mode = False
-                    note_buffer = ""
+                    note_chars = []
                 elif ch in (curses.KEY_BACKSPACE, 127, 8):
-                    note_buffer = note_buffer[:-1]
+                    if note_chars:
+                        note_chars.pop()
                 elif 32 <= ch <= 126:
-                    note_buffer += chr(ch)
+                    note_chars.append(chr(ch))
                 continue
             if ch in (ord('q'), ord('Q')):
                 tr.stop_event.set()
@@ -1951,44 +2679,26 @@ def run_curses_ui(source: str, sink: Optional[str], vosk_label: str, llm_model:
             elif ch in (ord('n'), ord('N')):
                 if active_search:
                     # With an active search, 'n'/'N' navigate results
-                    ql = active_search.lower()
-                    total = len(bullet_lines)
-                    if total > 0:
+                    matches = match_indices(active_search.lower())
+                    if matches:
                         if ch == ord('n'):
-                            start = (search_idx + 1) % total
-                            idx = None
-                            for i in range(total):
-                                j = (start + i) % total
-                                if ql in bullet_lines[j][0].lower():
-                                    idx = j; break
-                            if idx is not None:
-                                search_idx = idx
-                                left_follow = False
-                                max_offset = max(0, len(bullet_lines) - available_rows)
-                                left_offset = max(0, min(idx, max_offset))
-                                dbg(f"Search next -> {idx}")
+                            idx = matches[bisect.bisect_right(matches, search_idx) % len(matches)]
                         else:  # 'N'
-                            start = (search_idx - 1) % total if search_idx != -1 else (total - 1)
-                            idx = None
-                            for i in range(total):
-                                j = (start - i) % total
-                                if ql in bullet_lines[j][0].lower():
-                                    idx = j; break
-                            if idx is not None:
-                                search_idx = idx
-                                left_follow = False
-                                max_offset = max(0, len(bullet_lines) - available_rows)
-                                left_offset = max(0, min(idx, max_offset))
-                                dbg(f"Search prev -> {idx}")
+                            idx = matches[(bisect.bisect_left(matches, search_idx) - 1) % len(matches)]
+                        search_idx = idx
+                        left_follow = False
+                        left_offset = min(idx, max_offset_left)
+                        dbg(f"Search {'next' if ch == ord('n') else 'prev'} -> {idx}")
                 else:
                     note_mode = True
-                    note_buffer = ""
+                    note_chars = []
                     dbg("Note mode entered")
             elif ch == ord('c'):
                 user_msg = prompt_line('chat> ')
                 if not user_msg:
                     continue
                 history_before = state.get_chat_history()
+                encoded_before = state.get_encoded_chat_history(6)
                 chat_id = state.add_chat_question(user_msg)
                 if chat_id == -1:
                     continue
@@ -1996,8 +2706,8 @@ def run_curses_ui(source: str, sink: Optional[str], vosk_label: str, llm_model:
                     state.set_chat_answer(chat_id, "Chatbot disabled. Set OPENAI_API_KEY and --llm-model.")
                     push_status('Chatbot disabled; set OPENAI_API_KEY and --llm-model.', sticky=True)
                     continue
-                transcript_snapshot = list(transcript)
-                ctx_text_snapshot, ctx_labels_snapshot = state.get_context()
+                transcript_snapshot = transcript[-CHAT_CONTEXT_LINES:]
+                ctx_text_snapshot, ctx_labels_snapshot = state.get_context_tail(12000)
                 def _chat_worker():
                     ans = gpt_chat_response(
                         chat_prompt or DEFAULT_CHAT_PROMPT,
@@ -2008,7 +2718,9 @@ def run_curses_ui(source: str, sink: Optional[str], vosk_label: str, llm_model:
                         base_url,
                         llm_model,
                         context=(ctx_text_snapshot or None),
-                        context_labels=(ctx_labels_snapshot if ctx_labels_snapshot else None)
+                        context_labels=(ctx_labels_snapshot if ctx_labels_snapshot else None),
+                        on_delta=lambda text, cid=chat_id: state.set_pending_chat_delta(cid, text),
+                        encoded_history=encoded_before
                     )
                     if ans:
                         state.set_chat_answer(chat_id, ans)
@@ -2058,7 +2770,7 @@ def run_curses_ui(source: str, sink: Optional[str], vosk_label: str, llm_model:
                     dbg(f"Interview capture stopped; q_len={len(question) if question else 0}")
                     if question:
                         answering = True
-                        ctx_text_snapshot, ctx_labels_snapshot = state.get_context()
+                        ctx_text_snapshot, ctx_labels_snapshot = state.get_context_tail(10000)
                         def _answer():
                             nonlocal answering
                             try:
@@ -2069,8 +2781,10 @@ def run_curses_ui(source: str, sink: Optional[str], vosk_label: str, llm_model:
                                     base_url,
                                     llm_model,
                                     timeout=30.0,
+                                    budget=30.0,
                                     context=(ctx_text_snapshot or None),
-                                    context_labels=(ctx_labels_snapshot if ctx_labels_snapshot else None)
+                                    context_labels=(ctx_labels_snapshot if ctx_labels_snapshot else None),
+                                    on_delta=state.set_analysis
                                 )
                                 if ans:
                                     state.add_qa(question, ans)
@@ -2084,7 +2798,7 @@ def run_curses_ui(source: str, sink: Optional[str], vosk_label: str, llm_model:
             elif ch == ord('j'):
                 if active_pane == 'left':
                     left_follow = False
-                    left_offset = min(max(0, len(bullet_lines) - available_rows), left_offset + 1)
+                    left_offset = min(max_offset_left, left_offset + 1)
                 else:
                     right_follow = False
                     right_offset = min(max_offset_right, right_offset + 1)
@@ -2092,7 +2806,7 @@ def run_curses_ui(source: str, sink: Optional[str], vosk_label: str, llm_model:
                 if active_pane == 'left':
                     left_follow = False
                     left_offset = max(0, left_offset - 1)
-                    if (newest_first and left_offset <= 0) or ((not newest_first) and left_offset >= max(0, len(bullet_lines) - available_rows)):
+                    if (newest_first and left_offset <= 0) or ((not newest_first) and left_offset >= max_offset_left):
                         left_follow = True
                 else:
                     right_follow = False
@@ -2113,13 +2827,13 @@ def run_curses_ui(source: str, sink: Optional[str], vosk_label: str, llm_model:
                     search_idx = -1
                 else:
                     active_search = q
-                    ql = q.lower()
                     # find first occurrence
-                    idx = next((i for i, item in enumerate(bullet_lines) if ql in item[0].lower()), None)
+                    matches = match_indices(q.lower())
+                    idx = matches[0] if matches else None
                     if idx is not None:
                         search_idx = idx
                         left_follow = False
-                        left_offset = max(0, min(idx, max(0, len(bullet_lines) - available_rows)))
+                        left_offset = min(idx, max_offset_left)
                         dbg(f"Search set '{active_search}', first at {idx}")
                     else:
                         search_idx = -1
@@ -2367,6 +3081,7 @@ def main():
     print("\n[=] Finalizing session…")
     _, final_analysis, _ = state.snapshot()
     ctx_text_final, ctx_labels_final = state.get_context()
+    ctx_tail_final = ctx_text_final[-12000:]  # widest window the summary and post-session chat send
     prepare_done = _status_step("  • Preparing transcript… ")
     try:
         full_text = tr.read_transcript_tail_text(max_chars=50000)
@@ -2378,18 +3093,17 @@ def main():
     if api_key and llm_model and full_text:
         summary_done = _status_step("  • Generating executive summary… ")
         try:
-            import requests  # type: ignore
             url = (base_url.rstrip('/') if base_url else "https://api.openai.com/v1") + "/chat/completions"
             headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-            system_prompt = (summary_prompt.strip() if summary_prompt else "You are a summarizer. Produce a clear, well-structured report appropriate to the user's chosen template.")
+            system_prompt = (summary_prompt.strip() if summary_prompt else DEFAULT_SUMMARY_PROMPT)
             messages = [
-                {"role": "system", "content": system_prompt + ("\nUse provided CONTEXT to ground references; if unsure, say so." if (ctx_text_final or None) else "")},
+                {"role": "system", "content": system_prompt + (_SUMMARY_CONTEXT_SUFFIX if ctx_text_final else "")},
             ]
             if ctx_labels_final:
                 src_blob = "\n".join(f"- {lbl}" for lbl in ctx_labels_final[:12])
                 messages.append({"role": "system", "content": "CONTEXT SOURCES:\n" + src_blob})
             if ctx_text_final:
-                messages.append({"role": "system", "content": ("CONTEXT (may be partial):\n" + ctx_text_final[-12000:])})
+                messages.append({"role": "system", "content": ("CONTEXT (may be partial):\n" + ctx_tail_final)})
             messages.append({"role": "user", "content": full_text[-20000:]})
             data = {
                 "model": llm_model,
@@ -2397,25 +3111,10 @@ def main():
                 "temperature": 0.2,
                 "max_tokens": 800,
             }
-            attempt = 0
-            summary_success = False
-            while True:
-                r = requests.post(url, headers=headers, json=data, timeout=35)
-                if r.status_code == 200:
-                    executive = r.json().get("choices", [{}])[0].get("message", {}).get("content")
-                    summary_success = True
-                    break
-                if r.status_code == 400 and "max_tokens" in r.text and "max_completion_tokens" in r.text and 'max_completion_tokens' not in data:
-                    data["max_completion_tokens"] = data.pop("max_tokens", 800)
-                    attempt += 1
-                    if attempt < 3:
-                        continue
-                if r.status_code == 400 and '"param": "temperature"' in r.text and 'temperature' in data:
-                    data.pop("temperature", None)
-                    attempt += 1
-                    if attempt < 3:
-                        continue
-                break
+            # Same pooled connection, parameter rewrites and transient-error backoff as the live helpers;
+            # the budget keeps a failing API from holding shutdown behind the spinner for minutes
+            executive = _retrying_post(url, headers, data, 35, max_attempts=3, label='Summary', budget=45.0)
+            summary_success = executive is not None
             if summary_success:
                 summary_done()
             else:
@@ -2446,7 +3145,7 @@ def main():
             _restore_terminal_state()
             post_chat_pairs = post_session_chat_loop(
                 tr.read_full_transcript_lines(),
-                ctx_text_final or None,
+                ctx_tail_final or None,
                 ctx_labels_final or [],
                 api_key=api_key,
                 base_url=base_url,